@@ -1,113 +1,113 @@
-from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QProgressBar, QWidget, QFileDialog, QDateEdit, QScrollArea, QFrame
-from PySide6.QtCore import Qt, Signal, QDate
-import pandas as pd
-from datetime import datetime
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QWidget, QFileDialog, QDateEdit, QComboBox, QListView
+from PySide6.QtCore import Qt, Signal, QDate, QTimer
+from logic.ledger import get_ledger
+from logic.budget_model import BudgetListModel, BudgetDelegate
+
+# Delay before buffered ledger entries are committed, so quick successive entries share one commit
+LEDGER_FLUSH_DELAY_MS = 1000
+
+# Shared look of the entry form's inputs
+INPUT_STYLE = "padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #aaa;"
 
 class BudgetTrackerView(QWidget):
-    # Signal emitted when an expense is added or updated
+    # Signal emitted when an expense is added or a budget changes, with the category's budget and spent
     budget_updated = Signal(dict)
 
     def __init__(self):
         super().__init__()
 
-        # Main container for scroll area
+        # Main layout
         main_layout = QVBoxLayout(self)
-
-        # Scroll area that will contain the budget tracker
-        scroll_area = QScrollArea(self)
-        scroll_area.setWidgetResizable(True)
-
-        # Scrollable content container
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(20, 20, 20, 20)
-        scroll_layout.setSpacing(15)
-
-        # Sample budget categories and initial amounts
-        self.budget_data = {
-            'Groceries': {'budget': 500, 'spent': 0},
-            'Rent': {'budget': 1000, 'spent': 0},
-            'Utilities': {'budget': 200, 'spent': 0}
-        }
-
-        # Budget tracking widgets (labels, input fields, progress bars)
-        self.budget_widgets = {}
-        for category in self.budget_data:
-            category_layout = QVBoxLayout()
-
-            # Category label with enhanced styling
-            category_label = QLabel(f"{category} Budget")
-            category_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #333;")
-            category_layout.addWidget(category_label)
-
-            # Progress bar with a styled appearance
-            progress_bar = QProgressBar()
-            progress_bar.setMaximum(self.budget_data[category]['budget'])
-            progress_bar.setValue(self.budget_data[category]['spent'])
-            progress_bar.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #aaa;
-                    border-radius: 5px;
-                    background-color: #eee;
-                }
-                QProgressBar::chunk {
-                    background-color: #76c7c0;
-                    width: 20px;
-                }
-            """)
-            category_layout.addWidget(progress_bar)
-
-            # Label to show remaining budget with better styling
-            remaining_label = QLabel(f"Remaining: {self.budget_data[category]['budget']} - Spent: 0")
-            remaining_label.setStyleSheet("font-size: 14px; color: #555;")
-            category_layout.addWidget(remaining_label)
-
-            # Input box for expense amount
-            expense_input = QLineEdit()
-            expense_input.setPlaceholderText(f"Add expense to {category}")
-            expense_input.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #aaa;")
-            category_layout.addWidget(expense_input)
-
-            # Input box for description (optional)
-            description_input = QLineEdit()
-            description_input.setPlaceholderText(f"Description for {category} (optional)")
-            description_input.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #aaa;")
-            category_layout.addWidget(description_input)
-
-            # Date picker for the expense (defaults to today)
-            date_input = QDateEdit()
-            date_input.setDate(QDate.currentDate())
-            date_input.setCalendarPopup(True)  # Popup calendar for better UX
-            date_input.setStyleSheet("padding: 8px; font-size: 14px; border-radius: 5px; border: 1px solid #aaa;")
-            category_layout.addWidget(date_input)
-
-            # Button to add expense with improved styling
-            add_expense_button = QPushButton(f"Add to {category}")
-            add_expense_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #009688;
-                    color: white;
-                    padding: 10px;
-                    border-radius: 5px;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background-color: #00796b;
-                }
-            """)
-            add_expense_button.clicked.connect(lambda checked, cat=category: self.add_expense(cat))
-            category_layout.addWidget(add_expense_button)
-
-            scroll_layout.addLayout(category_layout)
-
-            # Store widgets for updating later
-            self.budget_widgets[category] = {
-                'progress_bar': progress_bar,
-                'remaining_label': remaining_label,
-                'expense_input': expense_input,
-                'description_input': description_input,
-                'date_input': date_input
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        # Categories, budgets and this month's spending all come from the persistent ledger
+        self.ledger = get_ledger()
+        self.period_start, self.period_end = self.current_period()
+        self.budget_model = BudgetListModel(self)
+        self.budget_model.set_budgets(self.ledger.categories(), self.ledger.budgets(),
+                                      self.ledger.spent_by_category(self.period_start, self.period_end))
+
+        # Commits buffered entries shortly after the last one is added
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(LEDGER_FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.ledger.flush)
+
+        period_label = QLabel(f"Budgets for {QDate.currentDate().toString('MMMM yyyy')}")
+        period_label.setStyleSheet("font-size: 20px; font-weight: bold; color: #2c3e50;")
+        main_layout.addWidget(period_label)
+
+        # One painted row per category; only the visible rows are ever drawn
+        self.budget_list = QListView()
+        self.budget_list.setModel(self.budget_model)
+        self.budget_list.setItemDelegate(BudgetDelegate(self.budget_list))
+        self.budget_list.setUniformItemSizes(True)
+        self.budget_list.setEditTriggers(QListView.NoEditTriggers)
+        self.budget_list.selectionModel().currentRowChanged.connect(self.select_category)
+        main_layout.addWidget(self.budget_list, 1)
+
+        # Entry form shared by every category
+        form_layout = QHBoxLayout()
+
+        # Category picker over the same model; typing a new name creates the category
+        self.category_input = QComboBox()
+        self.category_input.setModel(self.budget_model)
+        self.category_input.setEditable(True)
+        self.category_input.setInsertPolicy(QComboBox.NoInsert)
+        self.category_input.setStyleSheet(INPUT_STYLE)
+        form_layout.addWidget(self.category_input, 2)
+
+        # Input box for expense amount
+        self.expense_input = QLineEdit()
+        self.expense_input.setPlaceholderText("Amount")
+        self.expense_input.setStyleSheet(INPUT_STYLE)
+        self.expense_input.returnPressed.connect(self.add_expense)
+        form_layout.addWidget(self.expense_input, 1)
+
+        # Input box for description (optional)
+        self.description_input = QLineEdit()
+        self.description_input.setPlaceholderText("Description (optional)")
+        self.description_input.setStyleSheet(INPUT_STYLE)
+        form_layout.addWidget(self.description_input, 2)
+
+        # Date picker for the expense (defaults to today)
+        self.date_input = QDateEdit()
+        self.date_input.setDate(QDate.currentDate())
+        self.date_input.setCalendarPopup(True)  # Popup calendar for better UX
+        self.date_input.setStyleSheet(INPUT_STYLE)
+        form_layout.addWidget(self.date_input)
+
+        # Button to add expense with improved styling
+        add_expense_button = QPushButton("Add Expense")
+        add_expense_button.setStyleSheet("""
+            QPushButton {
+                background-color: #009688;
+                color: white;
+                padding: 10px;
+                border-radius: 5px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #00796b;
             }
+        """)
+        add_expense_button.clicked.connect(self.add_expense)
+        form_layout.addWidget(add_expense_button)
+        main_layout.addLayout(form_layout)
+
+        # Monthly budget of the selected category
+        budget_layout = QHBoxLayout()
+        self.budget_input = QLineEdit()
+        self.budget_input.setPlaceholderText("Monthly budget for the selected category")
+        self.budget_input.setStyleSheet(INPUT_STYLE)
+        self.budget_input.returnPressed.connect(self.set_budget)
+        budget_layout.addWidget(self.budget_input, 1)
+        set_budget_button = QPushButton("Set Budget")
+        set_budget_button.setStyleSheet(add_expense_button.styleSheet())
+        set_budget_button.clicked.connect(self.set_budget)
+        budget_layout.addWidget(set_budget_button)
+        main_layout.addLayout(budget_layout)
 
         # Add export button with improved styling
         export_button = QPushButton("Export Budget Data")
@@ -125,85 +125,94 @@ class BudgetTrackerView(QWidget):
             }
         """)
         export_button.clicked.connect(self.export_budget_data)  # Connect to the export function
-        scroll_layout.addWidget(export_button)
+        main_layout.addWidget(export_button)
 
-        # Set scroll area content
-        scroll_area.setWidget(scroll_content)
-        main_layout.addWidget(scroll_area)
+    def select_category(self, current, previous=None):
+        """Point the entry form at the category selected in the list."""
+        if current.isValid():
+            self.category_input.setCurrentIndex(current.row())
 
-    def add_expense(self, category):
-        """Add an expense to the selected category."""
-        expense_input = self.budget_widgets[category]['expense_input']
-        description_input = self.budget_widgets[category]['description_input']
-        date_input = self.budget_widgets[category]['date_input']
+    def selected_category(self):
+        return self.category_input.currentText().strip()
 
-        expense = expense_input.text()
-        description = description_input.text() if description_input.text() else category
-        date = date_input.date().toString("yyyy-MM-dd")
+    def add_expense(self, category=None):
+        """Add an expense to the given category, or the one selected in the form."""
+        category = category or self.selected_category()
+        expense = self.expense_input.text()
+        description = self.description_input.text() if self.description_input.text() else category
+        date = self.date_input.date().toString("yyyy-MM-dd")
 
-        if expense.isdigit():
+        if category and expense.isdigit():
             expense = int(expense)
-            self.budget_data[category]['spent'] += expense
-
-            # Emit the signal to notify that the budget has been updated
-            self.budget_updated.emit(self.budget_data)
+            # Buffered in the ledger and committed together with any entries that follow quickly
+            self.ledger.add(date, category, expense, 'USD', description)
+            self.flush_timer.start()
+            if self.period_start <= date < self.period_end:
+                # Only this category's row is repainted
+                self.budget_model.add_spent(category, expense)
+            elif self.budget_model.row_of(category) < 0:
+                self.budget_model.add_spent(category, 0)
+
+            # Append the entry to imported data in the shared store, so dashboard totals update
+            # incrementally. With nothing imported the entry stays in the ledger only: a one-row
+            # dataset would enable prediction and retraining on it alone.
+            # pandas is imported here so opening the tracker alone stays light.
+            from logic.transaction_store import get_store
+            store = get_store()
+            if not store.is_empty():
+                import pandas as pd
+                store.append(pd.DataFrame({
+                    'Date': [pd.Timestamp(date)],
+                    'Category': [category],
+                    'Amount': [float(expense)],
+                    'Currency': ['USD'],
+                    'Description': [description],
+                }))
 
             # Clear the input fields
-            expense_input.clear()
-            description_input.clear()
-            date_input.setDate(QDate.currentDate())  # Reset to today's date
+            self.expense_input.clear()
+            self.description_input.clear()
+            self.date_input.setDate(QDate.currentDate())  # Reset to today's date
 
-            # Update the UI to reflect the changes
             self.update_budget_ui(category)
 
-    def update_budget_ui(self, category):
-        """Update the progress bar and remaining label for the category."""
-        budget = self.budget_data[category]['budget']
-        spent = self.budget_data[category]['spent']
-
-        # Update progress bar
-        progress_bar = self.budget_widgets[category]['progress_bar']
-        progress_bar.setValue(spent)
+    def set_budget(self):
+        """Save the monthly budget typed for the selected category."""
+        category = self.selected_category()
+        budget = self.budget_input.text()
+        if category and budget.isdigit():
+            self.ledger.set_budgets({category: int(budget)})
+            self.budget_model.set_budget(category, int(budget))
+            self.budget_input.clear()
+            self.update_budget_ui(category)
 
-        # Update remaining budget label
-        remaining_label = self.budget_widgets[category]['remaining_label']
-        remaining = budget - spent
-        remaining_label.setText(f"Remaining: {remaining} - Spent: {spent}")
+    def current_period(self):
+        """First day of this month and of the next, as ISO dates bounding the budget period."""
+        today = QDate.currentDate()
+        start = QDate(today.year(), today.month(), 1)
+        return start.toString("yyyy-MM-dd"), start.addMonths(1).toString("yyyy-MM-dd")
 
-        # Optionally, handle cases where budget is exceeded
-        if spent > budget:
-            remaining_label.setStyleSheet("color: red;")
-        else:
-            remaining_label.setStyleSheet("color: black;")
+    def update_budget_ui(self, category):
+        """Bring the category's row (already repainted by the model) into view and notify listeners."""
+        row = self.budget_model.row_of(category)
+        self.budget_list.setCurrentIndex(self.budget_model.index(row))
+        self.budget_updated.emit({
+            'category': category,
+            'budget': self.budget_model.budget(category),
+            'spent': self.budget_model.spent(category),
+        })
 
     def export_budget_data(self):
-        """Export the budget data to CSV or Excel with the specified structure."""
+        """Export every ledger entry to CSV or Excel with the specified structure."""
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getSaveFileName(self, "Save Budget Data", "", "CSV Files (*.csv);;Excel Files (*.xlsx)", options=options)
         if file_path:
             try:
-                # Convert the budget data to a DataFrame matching the requested structure
-                data = {
-                    'Date': [],
-                    'Category': [],
-                    'Amount': [],
-                    'Currency': [],
-                    'Description': []
-                }
-                for category, values in self.budget_data.items():
-                    date_input = self.budget_widgets[category]['date_input']
-                    description_input = self.budget_widgets[category]['description_input']
-
-                    date = date_input.date().toString("yyyy-MM-dd")
-                    description = description_input.text() if description_input.text() else category
-
-                    data['Date'].append(date)  # User-specified date
-                    data['Category'].append(category)
-                    data['Amount'].append(values['spent'])  # Total spent amount
-                    data['Currency'].append('USD')  # Default currency
-                    data['Description'].append(description)  # User-specified or default description
-
-                df = pd.DataFrame(data)
+                import pandas as pd
+
+                # Every ledger entry, in the same structure the import accepts
+                df = pd.DataFrame(self.ledger.entries(),
+                                  columns=['Date', 'Category', 'Amount', 'Currency', 'Description'])
 
                 # Save as CSV or Excel depending on file extension
                 if file_path.endswith('.csv'):
@@ -1,20 +1,39 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QFrame, QFileDialog
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QFrame, QFileDialog, QDateEdit, QSlider
 )
+from PySide6.QtCore import Qt, QDate, QTimer
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QScrollArea
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from logic.chart import ChartCanvas
+from logic.figures import plot_category_bars, plot_category_donut, plot_daily_line
+from logic.perf import span
+from logic.transaction_store import get_store
 
+# Category filter entry that selects every category
+ALL_CATEGORIES = "All categories"
+
+# Shown in the charts when the filters match no transactions
+NO_MATCHES = "No transactions match the filters"
+
+# Quiet time after the last filter change before the charts are redrawn; KPIs update at once
+CHART_REDRAW_DELAY_MS = 150
 
 
 class DashboardView(QWidget):
     def __init__(self):
         super().__init__()
 
-        # Initialize the expense data to an empty DataFrame to avoid errors
-        self.expense_data = pd.DataFrame()
+        # Shared transaction store; the dashboard only reads its rollup cube
+        self.store = get_store()
+        # Precomputed aggregates built by the store at load time
+        self.rollup = self.store.rollup
+
+        # Dragging a range slider restarts the timer; the charts are only drawn for where it stops
+        self.chart_timer = QTimer(self)
+        self.chart_timer.setSingleShot(True)
+        self.chart_timer.setInterval(CHART_REDRAW_DELAY_MS)
+        self.chart_timer.timeout.connect(self.redraw_charts)
 
         # Main layout for the entire view
         main_layout = QVBoxLayout(self)
@@ -32,6 +51,9 @@ class DashboardView(QWidget):
         # Header
         scroll_layout.addLayout(self.create_header())
 
+        # Date range and category filters
+        scroll_layout.addLayout(self.create_filters())
+
         # KPI Cards (Top Row)
         scroll_layout.addLayout(self.create_kpi_cards())
 
@@ -64,20 +86,154 @@ class DashboardView(QWidget):
 
         self.setLayout(main_layout)
 
+        # Refresh whenever any view loads or appends data in the store
+        self.store.data_changed.connect(self.on_data_changed)
+        self.store.data_appended.connect(self.on_data_appended)
+        if not self.store.is_empty():
+            self.on_data_changed()
+
     def load_data(self):
-        """Load data from an Excel file and prepare it for visualization."""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx)")
+        """Load a file into the shared store; the dashboard refreshes via data_changed."""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx *.csv)")
         if file_path:
-            try:
-                self.expense_data = pd.read_excel(file_path)
-                # Ensure the 'Date' column is in datetime format
-                self.expense_data['Date'] = pd.to_datetime(self.expense_data['Date'])
-
-                # Update KPI and charts with the new data
-                self.update_kpi_cards()
-                self.update_charts()
-            except Exception as e:
-                print(f"Error loading file: {e}")
+            self.upload_button.setEnabled(False)
+            task = self.store.load_file_async(file_path, on_error=lambda message: print(f"Error loading file: {message}"))
+            task.signals.finished.connect(lambda: self.upload_button.setEnabled(True))
+
+    def on_data_changed(self):
+        """New data: reset the filters to everything and redraw."""
+        self.reset_filter_ranges(keep_selection=False)
+        self.apply_filters()
+
+    def on_data_appended(self, rows=None):
+        """Appended rows: widen the filter ranges, keeping the current selection, and redraw."""
+        self.reset_filter_ranges(keep_selection=True)
+        self.apply_filters()
+
+    def create_filters(self):
+        """Creates the date range sliders, date pickers and category picker."""
+        filters_layout = QHBoxLayout()
+
+        self.start_date = QDateEdit()
+        self.start_date.setCalendarPopup(True)
+        self.end_date = QDateEdit()
+        self.end_date.setCalendarPopup(True)
+        # One slider step per day; dragging either end re-slices the daily totals
+        self.start_slider = QSlider(Qt.Horizontal)
+        self.end_slider = QSlider(Qt.Horizontal)
+        self.start_slider.valueChanged.connect(lambda value: self.slider_moved(self.start_slider, self.start_date))
+        self.end_slider.valueChanged.connect(lambda value: self.slider_moved(self.end_slider, self.end_date))
+        self.start_date.dateChanged.connect(lambda date: self.date_edited(self.start_date, self.start_slider))
+        self.end_date.dateChanged.connect(lambda date: self.date_edited(self.end_date, self.end_slider))
+
+        self.category_filter = QComboBox()
+        self.category_filter.currentIndexChanged.connect(self.apply_filters)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(lambda: (self.reset_filter_ranges(keep_selection=False), self.apply_filters()))
+
+        for label, widget, stretch in (("From", self.start_date, 0), ("", self.start_slider, 1),
+                                       ("To", self.end_date, 0), ("", self.end_slider, 1),
+                                       ("Category", self.category_filter, 0)):
+            if label:
+                filters_layout.addWidget(QLabel(label))
+            filters_layout.addWidget(widget, stretch)
+        filters_layout.addWidget(reset_button)
+        self.filter_days = pd.DatetimeIndex([])
+        return filters_layout
+
+    def reset_filter_ranges(self, keep_selection):
+        """Fit the sliders, date pickers and category list to the store's days and categories."""
+        days = self.store.rollup.daily_totals().days
+        start, end = self.selected_range()
+        at_end = not len(self.filter_days) or end is None or end >= self.filter_days[-1]
+        category = self.category_filter.currentText()
+        self.filter_days = days
+
+        widgets = (self.start_slider, self.end_slider, self.start_date, self.end_date, self.category_filter)
+        for widget in widgets:
+            widget.blockSignals(True)
+        last = max(len(days) - 1, 0)
+        for slider in (self.start_slider, self.end_slider):
+            slider.setRange(0, last)
+        if len(days):
+            for date_edit in (self.start_date, self.end_date):
+                date_edit.setDateRange(QDate(days[0].year, days[0].month, days[0].day),
+                                       QDate(days[-1].year, days[-1].month, days[-1].day))
+        first = int(days.searchsorted(start)) if keep_selection and start is not None else 0
+        # A range that ended on the last day keeps following it as days are appended
+        last_selected = last if not keep_selection or at_end else min(int(days.searchsorted(end)), last)
+        self.start_slider.setValue(min(first, last))
+        self.end_slider.setValue(last_selected)
+        self.slider_moved(self.start_slider, self.start_date, redraw=False)
+        self.slider_moved(self.end_slider, self.end_date, redraw=False)
+
+        self.category_filter.clear()
+        self.category_filter.addItem(ALL_CATEGORIES)
+        self.category_filter.addItems([str(name) for name in self.store.rollup.daily_totals().categories])
+        if keep_selection and self.category_filter.findText(category) >= 0:
+            self.category_filter.setCurrentText(category)
+        for widget in widgets:
+            widget.blockSignals(False)
+
+    def slider_moved(self, slider, date_edit, redraw=True):
+        """Show the slider's day in its date picker, keeping From <= To, and re-slice."""
+        if not len(self.filter_days):
+            return
+        if slider is self.start_slider and slider.value() > self.end_slider.value():
+            self.end_slider.setValue(slider.value())
+        elif slider is self.end_slider and slider.value() < self.start_slider.value():
+            self.start_slider.setValue(slider.value())
+        day = self.filter_days[slider.value()]
+        date_edit.blockSignals(True)
+        date_edit.setDate(QDate(day.year, day.month, day.day))
+        date_edit.blockSignals(False)
+        if redraw:
+            self.apply_filters()
+
+    def date_edited(self, date_edit, slider):
+        """Move the slider to a date typed or picked in its date picker."""
+        if len(self.filter_days):
+            day = pd.Timestamp(date_edit.date().toPython())
+            slider.setValue(min(int(self.filter_days.searchsorted(day)), len(self.filter_days) - 1))
+
+    def selected_range(self):
+        """Selected (start, end) days, or (None, None) before any data is loaded."""
+        if not len(self.filter_days):
+            return None, None
+        return self.filter_days[self.start_slider.value()], self.filter_days[self.end_slider.value()]
+
+    def apply_filters(self):
+        """Update the KPIs for the selected date range and category, and schedule a chart redraw.
+
+        Unfiltered, they come straight from the store's rollup cube; otherwise
+        from a slice of its daily totals, located by binary search over the
+        sorted days, so the cost does not grow with the number of transactions.
+        Rendering the charts takes far longer than slicing, so while a slider
+        is dragged only the KPIs follow it and the charts catch up once it rests.
+        """
+        rollup = self.store.rollup
+        start, end = self.selected_range()
+        category = self.category_filter.currentText()
+        filtered = (category not in ("", ALL_CATEGORIES)
+                    or (len(self.filter_days) and (start > self.filter_days[0] or end < self.filter_days[-1])))
+        if filtered:
+            with span('filter dashboard', 'aggregate'):
+                categories = None if category == ALL_CATEGORIES else [category]
+                rollup = rollup.daily_totals().select(start, end, categories)
+        self.rollup = rollup
+        try:
+            self.update_kpi_cards()
+        except Exception as e:
+            print(f"Error updating dashboard: {e}")
+        self.chart_timer.start()
+
+    def redraw_charts(self):
+        """Draw the charts for the current selection (see apply_filters)."""
+        try:
+            self.update_charts()
+        except Exception as e:
+            print(f"Error updating dashboard: {e}")
 
     def create_header(self):
         """Creates the header layout with title, website selector, and time periods."""
@@ -140,15 +296,17 @@ class DashboardView(QWidget):
         return card
 
     def update_kpi_cards(self):
-        """Updates the KPI cards based on the loaded data."""
-        if not self.expense_data.empty:
-            total_expenses = self.expense_data['Amount'].sum()
-            total_categories = self.expense_data['Category'].nunique()
-            top_category = self.expense_data.groupby('Category')['Amount'].sum().idxmax()
-
-            self.kpi_cards[0].layout().itemAt(1).widget().setText(f"${total_expenses:,.2f}")
-            self.kpi_cards[1].layout().itemAt(1).widget().setText(f"{total_categories}")
-            self.kpi_cards[2].layout().itemAt(1).widget().setText(f"{top_category}")
+        """Updates the KPI cards based on the loaded data (zeros when nothing matches)."""
+        if self.rollup.is_empty():
+            total_expenses, total_categories, top_category = 0, 0, None
+        else:
+            total_expenses = self.rollup.total
+            total_categories = self.rollup.category_count()
+            top_category = self.rollup.top_category()
+
+        self.kpi_cards[0].layout().itemAt(1).widget().setText(f"${total_expenses:,.2f}")
+        self.kpi_cards[1].layout().itemAt(1).widget().setText(f"{total_categories}")
+        self.kpi_cards[2].layout().itemAt(1).widget().setText(f"{top_category}")
 
     def create_charts_section(self):
         """Creates the section with the charts (bar, line, and donut charts)."""
@@ -167,83 +325,42 @@ class DashboardView(QWidget):
         return charts_layout
 
     def update_charts(self):
-        """Updates the charts with the loaded expense data."""
-        # Remove bar chart if it exists
-        if self.row_1_layout.itemAt(0) is not None:
-            widget = self.row_1_layout.itemAt(0).widget()
-            if widget is not None:
-                widget.setParent(None)
-
-        # Remove donut chart if it exists
-        if self.row_1_layout.itemAt(1) is not None:
-            widget = self.row_1_layout.itemAt(1).widget()
-            if widget is not None:
-                widget.setParent(None)
-
-        # Add updated bar chart
-        self.row_1_layout.addWidget(self.create_bar_chart())
-    
-        # Add updated donut chart
-        self.row_1_layout.addWidget(self.create_donut_chart())
-
-        # Remove and update the line chart similarly
-        if self.line_chart is not None:
-            self.line_chart.setParent(None)
-    
-        self.line_chart = self.create_line_chart()
-        self.charts_layout.addWidget(self.line_chart)
-
+        """Updates the existing chart canvases in place with the loaded expense data."""
+        self.update_bar_chart()
+        self.update_donut_chart()
+        self.update_line_chart()
 
     def create_bar_chart(self):
         """Creates a bar chart for expenses by category."""
-        canvas = FigureCanvas(self.generate_bar_chart())
-        return canvas
+        self.bar_chart = ChartCanvas(width=6, height=4)
+        return self.bar_chart
 
     def create_line_chart(self):
         """Creates a line chart for expenses over time."""
-        canvas = FigureCanvas(self.generate_line_chart())
-        return canvas
+        return ChartCanvas(width=6, height=4)
 
     def create_donut_chart(self):
         """Creates a donut chart for expenses by category."""
-        canvas = FigureCanvas(self.generate_donut_chart())
-        return canvas
-
-    def generate_bar_chart(self):
-        """Generates a bar chart for expenses by category."""
-        fig, ax = plt.subplots(figsize=(6, 4))
-
-        if not self.expense_data.empty:
-            categories = self.expense_data.groupby('Category')['Amount'].sum()
-            categories.plot(kind='bar', ax=ax, color='#3498db')
-            ax.set_ylabel('Amount ($)')
-            ax.set_title('Expenses by Category')
-
-        return fig
-
-    def generate_line_chart(self):
-        """Generates a line chart for expenses over time."""
-        fig, ax = plt.subplots(figsize=(6, 4))
-
-        if not self.expense_data.empty:
-            self.expense_data.set_index('Date', inplace=True)
-            daily_expenses = self.expense_data.resample('D')['Amount'].sum()
-            daily_expenses.plot(kind='line', ax=ax, color='#2980b9', marker='o')
-            ax.set_title('Daily Expenses Over Time')
-            ax.set_ylabel('Amount ($)')
-
-        return fig
-
-    def generate_donut_chart(self):
-        """Generates a donut chart for expenses by category."""
-        fig, ax = plt.subplots(figsize=(6, 4))
-
-        if not self.expense_data.empty:
-            sizes = self.expense_data.groupby('Category')['Amount'].sum()
-            labels = sizes.index
-            wedges, _ = ax.pie(sizes, wedgeprops=dict(width=0.4), startangle=90, colors=['#3498db', '#e74c3c', '#95a5a6'])
-
-            ax.set(aspect="equal", title='Expenses by Category')
-            ax.legend(wedges, labels, title="Category", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-
-        return fig
+        self.donut_chart = ChartCanvas(width=6, height=4)
+        return self.donut_chart
+
+    def update_bar_chart(self):
+        """Updates the bar chart for expenses by category."""
+        if self.rollup.is_empty():
+            self.bar_chart.clear_chart('Expenses by Category', NO_MATCHES)
+        else:
+            plot_category_bars(self.bar_chart, self.rollup)
+
+    def update_line_chart(self):
+        """Updates the line chart for expenses over time."""
+        if self.rollup.is_empty():
+            self.line_chart.clear_chart('Daily Expenses Over Time', NO_MATCHES)
+        else:
+            plot_daily_line(self.line_chart, self.rollup)
+
+    def update_donut_chart(self):
+        """Updates the donut chart for expenses by category."""
+        if self.rollup.is_empty():
+            self.donut_chart.clear_chart('Expenses by Category', NO_MATCHES)
+        else:
+            plot_category_donut(self.donut_chart, self.rollup)
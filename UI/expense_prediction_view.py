@@ -1,8 +1,38 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QProgressBar, QScrollArea
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QProgressBar, QScrollArea, QTableView, QSpinBox, QComboBox
 from PySide6.QtCore import Qt
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
-import pickle
+from logic.transaction_store import get_store
+from logic.tasks import get_task_runner
+from logic.model_registry import get_model_registry
+from logic.prediction import run_prediction
+from logic.table_model import ChunkedTableModel
+from logic.chart import ChartCanvas
+from logic.figures import plot_forecast, plot_predictions
+from logic.forecast import FORECAST_FREQS, daily_totals, get_forecast_cache, run_forecast
+
+
+def predict_from_data(data, version=None, progress=None, partial=None):
+    """Score the data with the resident model; runs on the worker pool.
+
+    ``version`` is the store's version of ``data``, so unchanged data reuses its features.
+    """
+    registry = get_model_registry()
+    # Pre-trained model (compiled for small batches) and its scaler, already resident unless this is the first request
+    model_version, model, scaler = registry.current()
+    return run_prediction(data, model, model_path=registry.resolve_path(model_version), scaler=scaler,
+                          progress=progress, partial=partial,
+                          version=None if version is None else (version, model_version))
+
+
+def forecast_from_data(daily, horizon, freq, version=None, progress=None):
+    """Forecast future expenses per category with the resident model; runs on the worker pool.
+
+    ``version`` is the store's version of the data the daily totals came from.
+    """
+    # Each forecast step scores one small batch, where the compiled forest is fastest
+    model_version, model, scaler = get_model_registry().current()
+    return run_forecast(model, daily, horizon, freq, scaler=scaler, progress=progress,
+                        version=None if version is None else (version, model_version))
+
 
 class ExpensePredictionView(QWidget):
     def __init__(self):
@@ -42,6 +72,24 @@ class ExpensePredictionView(QWidget):
         self.upload_button.clicked.connect(self.upload_file)
         scroll_layout.addWidget(self.upload_button)
 
+        # Predict button to reuse data already loaded by another view
+        self.predict_button = QPushButton("Predict from Loaded Data")
+        self.predict_button.setStyleSheet("""
+            QPushButton {
+                background-color: #0091D5;
+                color: white;
+                padding: 10px;
+                font-size: 16px;
+                font-weight: bold;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #A5D8DD;
+            }
+        """)
+        self.predict_button.clicked.connect(self.predict_expenses)
+        scroll_layout.addWidget(self.predict_button)
+
         # Result label to display predictions or errors
         self.result_label = QLabel("")
         self.result_label.setStyleSheet("font-size: 14px; color: #FF0000;")  # Red color for errors
@@ -53,71 +101,218 @@ class ExpensePredictionView(QWidget):
         self.progress_bar.setValue(0)
         scroll_layout.addWidget(self.progress_bar)
 
+        # Predictions stream into a virtualized table as each chunk completes
+        self.prediction_model = ChunkedTableModel(['Date', 'Amount', 'Predicted'], self)
+        self.prediction_table = QTableView()
+        self.prediction_table.setModel(self.prediction_model)
+        self.prediction_table.setMinimumHeight(300)
+        scroll_layout.addWidget(self.prediction_table)
+
+        # Chart of predicted amounts, downsampled to the canvas width
+        self.prediction_chart = ChartCanvas(width=6, height=4)
+        scroll_layout.addWidget(self.prediction_chart)
+
+        # Forecast of the days or months after the last transaction, per category
+        forecast_layout = QHBoxLayout()
+        forecast_layout.addWidget(QLabel("Forecast the next"))
+        self.horizon_input = QSpinBox()
+        self.horizon_input.setRange(1, 365)
+        self.horizon_input.setValue(30)
+        forecast_layout.addWidget(self.horizon_input)
+        self.horizon_unit = QComboBox()
+        for freq, unit in FORECAST_FREQS.items():
+            self.horizon_unit.addItem(unit, freq)
+        forecast_layout.addWidget(self.horizon_unit)
+        self.forecast_button = QPushButton("Forecast")
+        self.forecast_button.setStyleSheet(self.predict_button.styleSheet())
+        self.forecast_button.clicked.connect(self.forecast_expenses)
+        forecast_layout.addWidget(self.forecast_button)
+        forecast_layout.addStretch(1)
+        scroll_layout.addLayout(forecast_layout)
+
+        self.forecast_label = QLabel("")
+        self.forecast_label.setStyleSheet("font-size: 14px; color: #333;")
+        scroll_layout.addWidget(self.forecast_label)
+
+        self.forecast_chart = ChartCanvas(width=6, height=4)
+        scroll_layout.addWidget(self.forecast_chart)
+
+        # Active model version, and retraining on the loaded transactions
+        model_layout = QHBoxLayout()
+        self.model_label = QLabel("")
+        self.model_label.setStyleSheet("font-size: 14px; color: #333;")
+        model_layout.addWidget(self.model_label, 1)
+        self.retrain_button = QPushButton("Retrain Model")
+        self.retrain_button.setStyleSheet(self.predict_button.styleSheet())
+        self.retrain_button.clicked.connect(self.retrain_model)
+        model_layout.addWidget(self.retrain_button)
+        scroll_layout.addLayout(model_layout)
+
         # Set scroll area content
         scroll_area.setWidget(scroll_content)
         main_layout.addWidget(scroll_area)
 
+        self._predict_task = None
+        self._forecast_task = None
+
+        # Start loading the model now so the first prediction does not wait for it
+        self.model_registry = get_model_registry()
+        self.model_registry.model_loaded.connect(self.show_model_version)
+        if not self.model_registry.is_loaded():
+            self.model_registry.load_async()
+        self._retrain_task = None
+        self.show_model_version()
+
+        self.store = get_store()
+        self.store.data_changed.connect(self.on_data_changed)
+        self.store.data_appended.connect(self.on_data_changed)
+        self.on_data_changed()
+
+    def on_data_changed(self):
+        """Enable prediction once the shared store holds data."""
+        self.predict_button.setEnabled(not self.store.is_empty())
+        self.forecast_button.setEnabled(not self.store.is_empty())
+        self.retrain_button.setEnabled(not self.store.is_empty() and self._retrain_task is None)
+
     def upload_file(self):
         """Function to handle file upload and predict expenses."""
         file_path, _ = QFileDialog.getOpenFileName(self, "Open File", "", "CSV Files (*.csv);;Excel Files (*.xlsx)")
         if file_path:
-            try:
-                # Load pre-trained model
-                self.result_label.setText("Loading model... Please wait.")
-                with open('prediction_expense_model/best_random_forest_(tuned)_model.pkl', 'rb') as f:
-                    model = pickle.load(f)
-
-                # Load data
-                self.result_label.setText("Loading data... Please wait.")
-                if file_path.endswith('.csv'):
-                    data = pd.read_csv(file_path)
-                else:
-                    data = pd.read_excel(file_path)
-
-                # Preprocessing: Convert Date to datetime, and generate features
-                if 'Date' in data.columns and 'Amount' in data.columns:
-                    data['Date'] = pd.to_datetime(data['Date'])
-                    data['day_of_week'] = data['Date'].dt.dayofweek  # Day of the week (0=Monday, 6=Sunday)
-                    data['month'] = data['Date'].dt.month  # Month
-
-                    # Create lag features
-                    data['lag_1'] = data['Amount'].shift(1)  # Previous day's amount
-                    data['lag_7'] = data['Amount'].shift(7)  # Previous week's amount
-
-                    # Drop rows with NaN values caused by lag features
-                    data.dropna(inplace=True)
-
-                    if not data.empty and len(data) > 0:
-                        # Update progress bar
-                        self.progress_bar.setValue(30)
-
-                        # Feature scaling (ensure features are in a proper range)
-                        scaler = StandardScaler()
-                        features_to_scale = ['lag_1', 'lag_7', 'day_of_week', 'month']
-                        data_scaled = scaler.fit_transform(data[features_to_scale])
-
-                        # Update progress bar
-                        self.progress_bar.setValue(60)
-
-                        # Make predictions
-                        predictions = model.predict(data_scaled)
-
-                        # Update progress bar
-                        self.progress_bar.setValue(90)
-
-                        # Format predictions to be more readable
-                        formatted_predictions = [f"${round(pred, 2):,}" for pred in predictions]
-
-                        # Display formatted predictions
-                        self.result_label.setText(f"Predicted Expenses: {', '.join(formatted_predictions)}")
-                        self.progress_bar.setValue(100)
-                    else:
-                        self.result_label.setText("Error: Processed data is empty after preprocessing.")
-                        self.progress_bar.setValue(0)
-                else:
-                    self.result_label.setText("Error: The file is missing required columns ('Date' and 'Amount').")
-                    self.progress_bar.setValue(0)
-
-            except Exception as e:
-                self.result_label.setText(f"Error processing file: {e}")
-                self.progress_bar.setValue(0)
+            # Load data into the shared store so other views reuse the same copy
+            self.result_label.setText("Loading data... Please wait.")
+            self.store.load_file_async(
+                file_path,
+                on_progress=self.show_progress,
+                on_loaded=self.predict_expenses,
+                on_error=self.show_error,
+            )
+
+    def predict_expenses(self):
+        """Predict expenses for the data currently held by the shared store."""
+        if not self.store.is_empty():
+            if self._predict_task is not None:
+                self._predict_task.cancel()
+            self.result_label.setText("Predicting... Please wait.")
+            self.progress_bar.setValue(0)
+            self.prediction_model.clear()
+
+            def current(callback):
+                # A cancelled task's queued chunks and progress still arrive; drop them
+                return lambda *args: callback(*args) if task is self._predict_task else None
+
+            task = get_task_runner().submit(
+                predict_from_data, self.store.data, self.store.version,
+                on_progress=current(self.show_progress),
+                on_partial=current(self.add_prediction_chunk),
+                on_result=current(self.show_predictions),
+                on_error=current(self.show_error),
+            )
+            self._predict_task = task
+
+    def forecast_expenses(self):
+        """Forecast the chosen horizon; a horizon already forecast for this data is redrawn at once."""
+        if self.store.is_empty():
+            return
+        horizon = self.horizon_input.value()
+        freq = self.horizon_unit.currentData()
+        # A retrained model gives a different forecast for the same data
+        cached = get_forecast_cache().get(((self.store.version, self.model_registry.active_version()), horizon, freq))
+        # Whatever is shown next supersedes a forecast still running
+        if self._forecast_task is not None:
+            self._forecast_task.cancel()
+            self._forecast_task = None
+        if cached is not None:
+            self.show_forecast(cached, horizon, freq)
+            return
+
+        def current(callback):
+            # A cancelled task's result or error still arrives; drop it
+            def guarded(*args):
+                if task is self._forecast_task:
+                    self._forecast_task = None
+                    callback(*args)
+            return guarded
+
+        self.forecast_label.setText("Forecasting... Please wait.")
+        # The cube is updated in place on this thread, so the worker gets a snapshot
+        task = get_task_runner().submit(
+            forecast_from_data, daily_totals(self.store.rollup), horizon, freq, self.store.version,
+            on_result=current(lambda forecast: self.show_forecast(forecast, horizon, freq)),
+            on_error=current(self.show_forecast_error),
+        )
+        self._forecast_task = task
+
+    def show_forecast(self, forecast, horizon, freq):
+        """Chart the forecast total and summarize it by category."""
+        plot_forecast(self.forecast_chart, forecast, freq)
+        by_category = forecast.groupby('Category', observed=True)['Predicted'].sum()
+        self.forecast_label.setText(
+            f"Forecast for the next {horizon} {FORECAST_FREQS[freq]}: ${by_category.sum():,.2f} in total, "
+            f"most in {by_category.idxmax()} (${by_category.max():,.2f})."
+        )
+
+    def show_forecast_error(self, message):
+        self.forecast_label.setText(f"Error forecasting: {message}")
+
+    def retrain_model(self):
+        """Retrain the forest on the loaded transactions in the background and switch to it."""
+        if self.store.is_empty() or self._retrain_task is not None:
+            return
+        self.retrain_button.setEnabled(False)
+        self.model_label.setText("Retraining... Please wait.")
+        self._retrain_task = self.model_registry.retrain_async(
+            daily_totals(self.store.rollup),
+            source=self.store.file_path,
+            on_progress=lambda percent, message: self.model_label.setText(message),
+            on_result=self.show_retrained,
+            on_error=self.show_retrain_error,
+        )
+
+    def show_retrained(self, metadata):
+        self._retrain_task = None
+        self.on_data_changed()
+        self.show_model_version()
+
+    def show_retrain_error(self, message):
+        self._retrain_task = None
+        self.on_data_changed()
+        self.model_label.setText(f"Error retraining model: {message}")
+
+    def show_model_version(self, model=None):
+        """Describe the active model: bundled, or a retrained version with its test metrics."""
+        if self._retrain_task is not None:
+            return
+        metadata = self.model_registry.metadata()
+        if metadata is None:
+            self.model_label.setText("Model: bundled (pre-trained)")
+            return
+        self.model_label.setText(
+            f"Model: {metadata['version']}, trained {metadata['created']} on {metadata['training_rows']:,} rows "
+            f"in {metadata['fit_seconds']:.1f} s; test R\u00b2 {metadata['metrics']['r2']:.2f}, "
+            f"RMSE {metadata['metrics']['rmse']:,.2f}"
+        )
+
+    def add_prediction_chunk(self, chunk):
+        """Append a chunk of streamed predictions to the table and chart."""
+        self.prediction_model.append_chunk(chunk)
+        plot_predictions(self.prediction_chart, self.prediction_model.column_values('Date'),
+                         self.prediction_model.column_values('Predicted'))
+
+    def show_progress(self, percent, message):
+        """Reflect worker progress in the progress bar and status label."""
+        self.progress_bar.setValue(percent)
+        if message:
+            self.result_label.setText(message)
+
+    def show_predictions(self, summary):
+        """Summarize the finished prediction; the rows are already in the table."""
+        self._predict_task = None
+        self.result_label.setText(
+            f"Predicted {summary['rows']:,} rows, total predicted expenses: ${summary['total']:,.2f}"
+        )
+        self.progress_bar.setValue(100)
+
+    def show_error(self, message):
+        self._predict_task = None
+        self.result_label.setText(f"Error processing file: {message}")
+        self.progress_bar.setValue(0)
@@ -1,7 +1,9 @@
-from PySide6.QtWidgets import QVBoxLayout, QPushButton, QLabel, QFileDialog, QWidget
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QWidget, QProgressBar, QTableView, QLineEdit, QComboBox, QPlainTextEdit
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
-from logic.file_import import import_excel
+from logic.transaction_store import get_store
+from logic.table_model import DataFrameTableModel
+from logic.dtypes import memory_report
 
 class ImportView(QWidget):
     def __init__(self):
@@ -26,21 +28,186 @@ class ImportView(QWidget):
         self.import_button.clicked.connect(self.load_file)
         layout.addWidget(self.import_button)
 
+        # Import every CSV/Excel file in a folder, parsed in parallel
+        self.import_folder_button = QPushButton("Import Folder")
+        self.import_folder_button.setFont(QFont("Arial", 14))
+        self.import_folder_button.setStyleSheet(self.import_button.styleSheet())
+        self.import_folder_button.clicked.connect(self.load_folder)
+        layout.addWidget(self.import_folder_button)
+
+        # Append another period's file to the data already loaded
+        self.append_button = QPushButton("Append Excel File")
+        self.append_button.setFont(QFont("Arial", 14))
+        self.append_button.setStyleSheet(self.import_button.styleSheet())
+        self.append_button.clicked.connect(self.append_file)
+        layout.addWidget(self.append_button)
+
         # Label to display the data or status
         self.data_label = QLabel("No file loaded.")
         self.data_label.setAlignment(Qt.AlignCenter)
         self.data_label.setFont(QFont("Arial", 12))
         layout.addWidget(self.data_label)
 
+        # Per-file rows and timings of the last multi-file import
+        self.import_report = QPlainTextEdit()
+        self.import_report.setReadOnly(True)
+        self.import_report.setMaximumHeight(120)
+        self.import_report.hide()
+        layout.addWidget(self.import_report)
+
+        # Progress bar fed by the streaming CSV import
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        # Filter row: column selector and a case-insensitive "contains" filter
+        filter_layout = QHBoxLayout()
+        self.filter_column = QComboBox()
+        filter_layout.addWidget(self.filter_column)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter rows...")
+        self.filter_input.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_input)
+        layout.addLayout(filter_layout)
+
+        # Virtualized table over the imported data; rows are fetched as you scroll
+        self.table_model = DataFrameTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.horizontalHeader().setSortIndicatorShown(False)
+        layout.addWidget(self.table_view)
+
         self.setLayout(layout)
 
+        # Show whatever is in the shared store, whichever view loaded it
+        self._stale = False
+        self.store = get_store()
+        self.store.data_changed.connect(self.show_data)
+        self.store.data_appended.connect(self.mark_stale)
+        if not self.store.is_empty():
+            self.show_data()
+
     def load_file(self):
-        """Function to load file and display data."""
+        """Function to load one or more files into the shared store."""
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Open Excel Files", "", "Excel Files (*.xlsx *.csv)")
+
+        if len(file_paths) == 1:
+            self.import_button.setEnabled(False)
+            self.progress_bar.setValue(0)
+            self.data_label.setText("Importing...")
+            self.import_report.hide()
+            # Parsing runs on the worker pool; progress arrives on the UI thread
+            task = self.store.load_file_async(
+                file_paths[0],
+                on_progress=self.report_progress,
+                on_error=lambda message: self.data_label.setText("Error loading file."),
+            )
+            task.signals.finished.connect(lambda: self.import_button.setEnabled(True))
+        elif file_paths:
+            self.load_files(file_paths)
+
+    def load_folder(self):
+        """Load every CSV/Excel file in a folder into the shared store."""
+        folder = QFileDialog.getExistingDirectory(self, "Open Folder")
+        if folder:
+            self.load_files([folder])
+
+    def load_files(self, paths):
+        """Parse several files in parallel, deduplicate overlapping rows and publish them."""
+        self.import_button.setEnabled(False)
+        self.import_folder_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.data_label.setText("Importing...")
+        self.import_report.clear()
+        self.import_report.show()
+        task = self.store.load_files_async(
+            paths,
+            on_progress=self.report_file_progress,
+            on_loaded=self.show_import_report,
+            on_error=lambda message: self.data_label.setText(f"Error loading files: {message}"),
+        )
+        task.signals.finished.connect(lambda: self.import_button.setEnabled(True))
+        task.signals.finished.connect(lambda: self.import_folder_button.setEnabled(True))
+
+    def report_file_progress(self, percent, message):
+        """Log each file as it finishes parsing."""
+        self.progress_bar.setValue(percent)
+        if message:
+            self.import_report.appendPlainText(message)
+
+    def show_import_report(self, report):
+        """Summarize a multi-file import: per-file rows and timings, and duplicates dropped."""
+        lines = []
+        for file in report['files']:
+            name = file['file']
+            if file['error']:
+                lines.append(f"{name}: failed ({file['error']})")
+            else:
+                lines.append(f"{name}: {file['rows']:,} rows in {file['seconds']:.2f} s")
+        self.import_report.setPlainText("\n".join(lines))
+        read = sum(1 for file in report['files'] if not file['error'])
+        self.data_label.setText(
+            f"{report['rows']:,} rows from {read} of {len(report['files'])} files in {report['seconds']:.1f} s, "
+            f"{report['duplicates']:,} duplicate rows dropped."
+        )
+
+    def append_file(self):
+        """Function to append a file's rows to the shared store incrementally."""
         file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx *.csv)")
-        
+
         if file_path:
-            data = import_excel(file_path)
-            if data is not None:
-                self.data_label.setText(str(data.head()))  # Display the first few rows
-            else:
-                self.data_label.setText("Error loading file.")
+            self.append_button.setEnabled(False)
+            self.progress_bar.setValue(0)
+            self.data_label.setText("Importing...")
+            task = self.store.append_file_async(
+                file_path,
+                on_progress=self.report_progress,
+                on_loaded=lambda: self.data_label.setText(f"Appended {file_path}."),
+                on_error=lambda message: self.data_label.setText("Error loading file."),
+            )
+            task.signals.finished.connect(lambda: self.append_button.setEnabled(True))
+
+    def report_progress(self, percent, message):
+        """Show bytes and rows processed so far during a streamed import."""
+        self.progress_bar.setValue(percent)
+        self.data_label.setText(f"Importing... {message}")
+
+    def show_data(self):
+        """Browse the store's data in the table."""
+        self._stale = False
+        data = self.store.data
+        self.progress_bar.setValue(100)
+        # Memory recorded when the file was parsed (not kept once rows are appended)
+        memory = data.attrs.get('memory')
+        if memory and memory['after']:
+            after, before = sum(memory['after'].values()), sum(memory['before'].values())
+            self.data_label.setText(f"{len(data):,} rows loaded, {after / 2**20:,.1f} MB in memory "
+                                    f"({before / 2**20:,.1f} MB before compaction).")
+            self.data_label.setToolTip(memory_report(memory['before'], memory['after']))
+        else:
+            self.data_label.setText(f"{len(data):,} rows loaded.")
+            self.data_label.setToolTip("")
+        self.table_model.set_frame(data)
+        self.table_view.horizontalHeader().setSortIndicatorShown(False)
+        self.filter_column.clear()
+        self.filter_column.addItems(self.table_model.columns)
+        if self.filter_input.text():
+            self.apply_filter()
+
+    def mark_stale(self):
+        """Refresh after appends, but only when the table is actually on screen."""
+        self._stale = True
+        if self.isVisible():
+            self.show_data()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.show_data()
+
+    def apply_filter(self):
+        """Filter the table on the selected column."""
+        self.table_model.set_filter(self.filter_column.currentIndex(), self.filter_input.text())
+        self.data_label.setText(f"{self.table_model.total_rows():,} matching rows.")
@@ -1,14 +1,27 @@
 from PySide6.QtWidgets import QVBoxLayout, QLabel, QWidget, QPushButton, QFileDialog, QComboBox
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from logic.chart import ChartCanvas
-import pandas as pd
+from logic.figures import PERIOD_TITLES, plot_period_comparison
+from logic.rollup import cached_period_table
+from logic.transaction_store import get_store
+
+# Quiet time after the last period change or data update before the charts are redrawn
+REDRAW_DELAY_MS = 150
 
 class ReportsView(QWidget):
     def __init__(self):
         super().__init__()
 
-        # Placeholder for the expense data
-        self.expense_data = pd.DataFrame()
+        # Shared transaction store; reports only read its rollup cube
+        self.store = get_store()
+        # (dataset version, period) currently drawn, so unchanged selections skip the redraw
+        self.drawn = None
+
+        # Rapid toggling or a burst of appends restarts the timer; only the final state is drawn
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(REDRAW_DELAY_MS)
+        self.redraw_timer.timeout.connect(self.update_comparison)
 
         # Main layout
         layout = QVBoxLayout()
@@ -23,7 +36,7 @@ class ReportsView(QWidget):
         self.time_period_selector = QComboBox()
         self.time_period_selector.addItem("Compare by Month")
         self.time_period_selector.addItem("Compare by Year")
-        self.time_period_selector.currentIndexChanged.connect(self.update_comparison)
+        self.time_period_selector.currentIndexChanged.connect(self.schedule_redraw)
         layout.addWidget(self.time_period_selector)
 
         # Line chart canvas
@@ -41,49 +54,52 @@ class ReportsView(QWidget):
 
         self.setLayout(layout)
 
+        # Refresh whenever any view loads or appends data in the store
+        self.store.data_changed.connect(self.on_data_changed)
+        self.store.data_appended.connect(self.on_data_changed)
+        if not self.store.is_empty():
+            self.update_comparison()
+
     def load_data(self):
-        """Load data from an Excel file and prepare it for comparison."""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx)")
+        """Load a file into the shared store; the charts refresh via data_changed."""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx *.csv)")
         if file_path:
-            try:
-                # Load the data from the Excel file
-                self.expense_data = pd.read_excel(file_path)
+            self.load_data_button.setEnabled(False)
+            task = self.store.load_file_async(file_path, on_error=lambda message: print(f"Error loading file: {message}"))
+            task.signals.finished.connect(lambda: self.load_data_button.setEnabled(True))
 
-                # Ensure the 'Date' column is in datetime format
-                self.expense_data['Date'] = pd.to_datetime(self.expense_data['Date'])
+    def on_data_changed(self, rows=None):
+        """Redo the selected comparison from the store's current rollup, once updates settle."""
+        self.schedule_redraw()
 
-                # Perform the initial comparison by month
-                self.compare_by_month()
-            except Exception as e:
-                print(f"Error loading file: {e}")
+    def schedule_redraw(self):
+        """(Re)start the debounce timer; the comparison is redrawn once it times out."""
+        self.redraw_timer.start()
 
     def compare_by_month(self):
         """Compare expenses by month."""
-        if not self.expense_data.empty:
-            df_by_month = self.expense_data.groupby(self.expense_data['Date'].dt.to_period('M')).agg({
-            'Amount': 'sum'
-            })
-            df_by_month.reset_index(inplace=True)
-            df_by_month['Date'] = df_by_month['Date'].astype(str)  # Convert to string for chart
-            self.update_charts(df_by_month, 'Date', 'Amount', "Monthly Expenses")
+        self.compare_by_period('M', PERIOD_TITLES['M'])
 
     def compare_by_year(self):
         """Compare expenses by year."""
-        if not self.expense_data.empty:
-            df_by_year = self.expense_data.groupby(self.expense_data['Date'].dt.to_period('Y')).agg({
-                'Amount' : 'sum'
-            })
-            df_by_year.reset_index(inplace=True)
-            df_by_year['Date'] = df_by_year['Date'].astype(str)  # Convert to string for chart
-            self.update_charts(df_by_year, 'Date', 'Amount', "Yearly Expenses")
+        self.compare_by_period('Y', PERIOD_TITLES['Y'])
+
+    def compare_by_period(self, period, title):
+        """Chart period totals read from the store's precomputed rollup cube (memoized per dataset version)."""
+        if self.drawn == (self.store.version, period):
+            return
+        if not self.store.rollup.is_empty():
+            df_by_period = cached_period_table(self.store.rollup, period, self.store.version)
+            self.update_charts(df_by_period, 'Date', 'Amount', title)
+            self.drawn = (self.store.version, period)
 
     def update_charts(self, df, x_column, y_column, title):
         """Update line and bar charts based on the comparison data."""
-        self.line_chart.plot_line_chart(df, x_column, y_column, f"{title} (Line Chart)")
-        self.bar_chart.plot_bar_chart(df, x_column, y_column, f"{title} (Bar Chart)")
+        plot_period_comparison(self.line_chart, self.bar_chart, df, x_column, y_column, title)
 
     def update_comparison(self):
         """Update the comparison based on the selected time period."""
+        self.redraw_timer.stop()
         if self.time_period_selector.currentIndex() == 0:
             self.compare_by_month()
         else:
@@ -1,6 +1,18 @@
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from PySide6.QtWidgets import (
+    QLabel, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QTableWidget, QTableWidgetItem, QFileDialog,
+    QHeaderView,
+)
 from PySide6.QtGui import QFont
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+from logic.perf import get_tracer
+
+# Most recent spans listed in the panel; the full set is in the exported trace
+RECENT_SPANS = 200
+
+
+def _mb(num_bytes):
+    return "" if num_bytes is None else f"{num_bytes / 2**20:,.1f}"
+
 
 class SettingsView(QWidget):
     def __init__(self):
@@ -15,10 +27,91 @@ class SettingsView(QWidget):
         title_label.setStyleSheet("color: #7289da;")
         layout.addWidget(title_label)
 
-        # Placeholder for settings options
-        settings_label = QLabel("Settings will be here.")
-        settings_label.setAlignment(Qt.AlignCenter)
-        settings_label.setFont(QFont("Arial", 16))
-        layout.addWidget(settings_label)
+        # Performance panel: where the time went, per stage and per span
+        perf_label = QLabel("Performance")
+        perf_label.setFont(QFont("Arial", 16))
+        layout.addWidget(perf_label)
+
+        button_layout = QHBoxLayout()
+        self.export_button = QPushButton("Export Chrome Trace...")
+        self.export_button.clicked.connect(self.export_trace)
+        button_layout.addWidget(self.export_button)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.clear_spans)
+        button_layout.addWidget(self.clear_button)
+        layout.addLayout(button_layout)
+
+        # Totals per stage, slowest first
+        self.summary_table = self.create_table(["Stage", "Category", "Count", "Total (ms)", "Max (ms)", "Rows"])
+        layout.addWidget(self.summary_table)
+
+        # Individual spans, newest first
+        self.spans_table = self.create_table(
+            ["Stage", "Start (s)", "Duration (ms)", "Rows", "Peak memory (MB)", "Memory growth (MB)", "Thread"]
+        )
+        layout.addWidget(self.spans_table)
 
         self.setLayout(layout)
+
+        # Poll the tracer while visible; it is Qt-free and records from worker threads
+        self.tracer = get_tracer()
+        self._shown_version = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def create_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        return table
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        """Redraw both tables if spans were recorded since the last refresh."""
+        if self.tracer.version == self._shown_version:
+            return
+        self._shown_version = self.tracer.version
+
+        summary = self.tracer.summary()
+        self.fill_table(self.summary_table, [
+            [stage['name'], stage['category'], stage['count'], f"{stage['total'] * 1000:,.1f}",
+             f"{stage['max'] * 1000:,.1f}", f"{stage['rows']:,}" if stage['rows'] else ""]
+            for stage in summary
+        ])
+        spans = self.tracer.spans()[-RECENT_SPANS:][::-1]
+        self.fill_table(self.spans_table, [
+            [span['name'], f"{span['start']:,.3f}", f"{span['duration'] * 1000:,.1f}",
+             f"{span['rows']:,}" if span['rows'] is not None else "", _mb(span['peak_rss']),
+             _mb(span['peak_growth']), span['thread']]
+            for span in spans
+        ])
+
+    def fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def clear_spans(self):
+        self.tracer.clear()
+        self.refresh()
+
+    def export_trace(self):
+        """Save the recorded spans as a Chrome trace (open in chrome://tracing or Perfetto)."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "trace.json", "JSON Files (*.json)")
+        if file_path:
+            try:
+                self.tracer.export_chrome_trace(file_path)
+            except Exception as e:
+                print(f"Error exporting trace: {e}")
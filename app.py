@@ -1,18 +1,31 @@
+import time
+_PROCESS_START = time.perf_counter()  # Taken first so startup timings include every import
+
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QFrame
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import QSize
-from ui.dashboard_view import DashboardView
-from ui.import_view import ImportView
-from ui.reports_view import ReportsView
-from ui.settings_view import SettingsView
-from ui.budget_tracker_view import BudgetTrackerView
-from ui.expense_prediction_view import ExpensePredictionView  # Import the new view for expense prediction
+from logic.startup_timing import get_startup_timer
 import sys
 
+# Views by stacked-widget index. They are imported and constructed on first
+# navigation, so pandas, matplotlib and scikit-learn load only when needed.
+VIEWS = [
+    ("ui.dashboard_view", "DashboardView"),                  # Index 0: Dashboard
+    ("ui.import_view", "ImportView"),                        # Index 1: Import Data
+    ("ui.reports_view", "ReportsView"),                      # Index 2: Reports
+    ("ui.settings_view", "SettingsView"),                    # Index 3: Settings
+    ("ui.budget_tracker_view", "BudgetTrackerView"),         # Index 4: Budget Tracker
+    ("ui.expense_prediction_view", "ExpensePredictionView"), # Index 5: Expense Prediction
+]
+
 class MainApp(QWidget):
     def __init__(self):
         super().__init__()
 
+        self.startup_timer = get_startup_timer(_PROCESS_START)
+        self.startup_timer.record("app.py imports (PySide6)", time.perf_counter() - _PROCESS_START)
+        self.startup_timer.watch_first_paint(self)
+
         self.setWindowTitle("Finance Dashboard")
         self.setGeometry(300, 100, 1200, 800)
         self.setStyleSheet("""
@@ -62,13 +75,10 @@ class MainApp(QWidget):
         # Create stacked widget to switch between views
         self.stacked_widget = QStackedWidget()
 
-        # Add the different views to the stacked widget
-        self.stacked_widget.addWidget(DashboardView())  # Index 0: Dashboard
-        self.stacked_widget.addWidget(ImportView())     # Index 1: Import Data
-        self.stacked_widget.addWidget(ReportsView())    # Index 2: Reports
-        self.stacked_widget.addWidget(SettingsView())   # Index 3: Settings
-        self.stacked_widget.addWidget(BudgetTrackerView())  # Index 4: Budget Tracker
-        self.stacked_widget.addWidget(ExpensePredictionView())  # Index 5: Expense Prediction
+        # Reserve a slot per view; placeholders are swapped for the real views on first use
+        self.views = [None] * len(VIEWS)
+        for _ in VIEWS:
+            self.stacked_widget.addWidget(QWidget())
 
         # Add sidebar and stacked widget to the main layout
         main_layout.addWidget(sidebar_frame)
@@ -76,6 +86,9 @@ class MainApp(QWidget):
 
         self.setLayout(main_layout)
 
+        # Build the dashboard right after the first paint so the window appears immediately
+        self.startup_timer.first_painted.connect(self.show_dashboard)
+
     def create_sidebar_button(self, text, icon_path):
         """Create a styled sidebar button with an icon."""
         button = QPushButton(text)
@@ -97,30 +110,43 @@ class MainApp(QWidget):
         """)
         return button
 
+    def show_view(self, index):
+        """Display the view at ``index``, importing and constructing it on first use."""
+        if self.views[index] is None:
+            module_name, class_name = VIEWS[index]
+            module = self.startup_timer.timed_import(module_name)
+            view = self.startup_timer.timed_construct(class_name, getattr(module, class_name))
+            placeholder = self.stacked_widget.widget(index)
+            self.stacked_widget.insertWidget(index, view)
+            self.stacked_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.views[index] = view
+        self.stacked_widget.setCurrentIndex(index)
+
     # Sidebar button actions to switch views
     def show_dashboard(self):
         """Display the Dashboard view."""
-        self.stacked_widget.setCurrentIndex(0)
+        self.show_view(0)
 
     def show_import(self):
         """Display the Import Data view."""
-        self.stacked_widget.setCurrentIndex(1)
+        self.show_view(1)
 
     def show_reports(self):
         """Display the Reports view."""
-        self.stacked_widget.setCurrentIndex(2)
+        self.show_view(2)
 
     def show_settings(self):
         """Display the Settings view."""
-        self.stacked_widget.setCurrentIndex(3)
+        self.show_view(3)
 
     def show_budget_tracker(self):
         """Display the Budget Tracker view."""
-        self.stacked_widget.setCurrentIndex(4)
+        self.show_view(4)
 
     def show_expense_prediction(self):
         """Display the Expense Prediction view."""
-        self.stacked_widget.setCurrentIndex(5)
+        self.show_view(5)
 
 
 if __name__ == "__main__":
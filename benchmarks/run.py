@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import matplotlib
+# Charts are rendered off screen, the same way logic.report draws them
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_ledger, write_ledger
+from logic.forest import CompiledForest
+from logic.figures import ChartFigure, plot_category_bars, plot_category_donut, plot_daily_line
+from logic.file_import import import_excel
+from logic.ingest_cache import IngestCache
+from logic.prediction import (
+    DEFAULT_MODEL_PATH, PROCESS_POOL_MIN_ROWS, build_features, load_model_file, model_scaler, run_prediction,
+)
+from logic.rollup import RollupCube
+
+# Ledger sizes run by default, in rows
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# openpyxl is slow and Excel caps sheets at 1,048,576 rows, so XLSX is only timed up to here
+XLSX_MAX_ROWS = 100_000
+
+# The forest scores roughly 10^5 rows a second, so prediction is only timed up to here
+PREDICT_MAX_ROWS = 1_000_000
+
+# Batch sizes scored by model.predict and the compiled forest: one row, one step of a
+# per-category forecast, an interactive upload and a large file
+INFERENCE_BATCHES = [1, 16, 1_000, 100_000]
+
+
+def measure(fn, repeat=3, setup=None):
+    """Wall-clock seconds of ``repeat`` calls; ``setup()`` (untimed) builds each call's argument."""
+    times = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        started = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def draw_chart(plot):
+    """Return a callable that plots a cube on a fresh figure and renders it with Agg."""
+    def run(cube):
+        chart = ChartFigure(width=8, height=5)
+        plot(chart, cube)
+        FigureCanvasAgg(chart.fig).draw()
+    return run
+
+
+def run_size(rows, categories, workdir, repeat, model=None, model_path=None):
+    """Run every benchmark on one synthetic ledger; yields ``(name, times)``."""
+    data = generate_ledger(rows, categories)
+    csv_path = write_ledger(data, os.path.join(workdir, f'ledger_{rows}.csv'))
+
+    # Import: streaming CSV parse, a warm ingest cache hit, and openpyxl
+    yield 'import_csv', measure(lambda: import_excel(csv_path, use_cache=False), repeat)
+    frame = import_excel(csv_path, use_cache=False)
+    cache = IngestCache(cache_dir=os.path.join(workdir, 'cache'))
+    cache.put(csv_path, frame)
+    yield 'import_cache_hit', measure(lambda: cache.get(csv_path), repeat)
+    if rows <= XLSX_MAX_ROWS:
+        xlsx_path = write_ledger(data, os.path.join(workdir, f'ledger_{rows}.xlsx'))
+        yield 'import_xlsx', measure(lambda: import_excel(xlsx_path, use_cache=False), repeat)
+    del data
+
+    # Aggregation: building the cube, then the ReportsView month/year tables from a cold cube
+    build_cube = lambda: RollupCube.from_frame(frame)
+    yield 'rollup_build', measure(build_cube, repeat)
+    yield 'report_monthly', measure(lambda cube: cube.period_table('M'), repeat, build_cube)
+    yield 'report_yearly', measure(lambda cube: cube.period_table('Y'), repeat, build_cube)
+    # The groupby ReportsView ran per click before the cube, for reference
+    yield 'groupby_monthly_raw', measure(
+        lambda: frame.groupby(frame['Date'].dt.to_period('M'))['Amount'].sum(), repeat)
+
+    # Dashboard charts, drawn from a cube and rendered
+    cube = build_cube()
+    yield 'chart_category_bar', measure(draw_chart(plot_category_bars), repeat, lambda: cube)
+    yield 'chart_category_donut', measure(draw_chart(plot_category_donut), repeat, lambda: cube)
+    yield 'chart_daily_line', measure(draw_chart(plot_daily_line), repeat, lambda: cube)
+
+    # Prediction: features alone, then features + scaling + model.predict
+    if model is not None and rows <= PREDICT_MAX_ROWS:
+        yield 'build_features', measure(lambda: build_features(frame), repeat)
+        scaler = model_scaler(model_path) if model_path else None
+        yield 'predict', measure(lambda: run_prediction(frame, model, workers=1, scaler=scaler), repeat)
+        if rows >= PROCESS_POOL_MIN_ROWS:
+            yield 'predict_pool', measure(
+                lambda: run_prediction(frame, model, model_path=model_path, scaler=scaler), repeat)
+
+
+def run_inference(model, repeat):
+    """Time model.predict against the compiled forest per batch size; yields ``(name, rows, times)``."""
+    try:
+        compiled = CompiledForest.from_sklearn(model)
+    except TypeError:
+        return
+    rng = np.random.default_rng(0)
+    for rows in INFERENCE_BATCHES:
+        X = rng.standard_normal((rows, compiled.n_features))
+        yield 'forest_sklearn', rows, measure(lambda: model.predict(X), repeat)
+        yield 'forest_compiled', rows, measure(lambda: compiled.predict_compiled(X), repeat)
+
+
+def environment():
+    """Versions and machine details stored with each run, so results are comparable."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def run(sizes, categories, repeat, output, model_path=DEFAULT_MODEL_PATH, predict=True):
+    """Run the suite over every size, writing the JSON results after each benchmark."""
+    model = None
+    if predict:
+        try:
+            model = load_model_file(model_path)
+        except Exception as e:
+            print(f"Error loading model, skipping prediction benchmarks: {e}")
+
+    report = {
+        'environment': environment(),
+        'settings': {'sizes': sizes, 'categories': categories, 'repeat': repeat},
+        'results': [],
+    }
+
+    def record(name, rows, times, categories=categories):
+        report['results'].append({
+            'benchmark': name,
+            'rows': rows,
+            'categories': categories,
+            'times': times,
+            'min': min(times),
+            'median': statistics.median(times),
+        })
+        print(f"{name:<22} {rows:>12,} rows  min {min(times) * 1000:10.1f} ms")
+        # Rewrite as we go so an interrupted run still leaves its results
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    with tempfile.TemporaryDirectory(prefix='finance_bench_') as workdir:
+        for rows in sizes:
+            for name, times in run_size(rows, categories, workdir, repeat, model, model_path):
+                record(name, rows, times)
+    if model is not None:
+        # Raw inference on random feature rows, independent of the ledger sizes
+        for name, rows, times in run_inference(model, repeat):
+            record(name, rows, times, categories=None)
+    return report
+
+
+def compare(base_path, new_path):
+    """Print the min time of every benchmark in two result files and their ratio."""
+    with open(base_path) as f:
+        base = {(r['benchmark'], r['rows']): r['min'] for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = {(r['benchmark'], r['rows']): r['min'] for r in json.load(f)['results']}
+    print(f"{'benchmark':<22} {'rows':>12} {'base ms':>10} {'new ms':>10} {'new/base':>9}")
+    for key in sorted(base.keys() & new.keys(), key=lambda k: (k[1], k[0])):
+        name, rows = key
+        print(f"{name:<22} {rows:>12,} {base[key] * 1000:10.1f} {new[key] * 1000:10.1f} "
+              f"{new[key] / base[key]:9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description="Time import, aggregation, charts and prediction on synthetic ledgers.",
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="ledger sizes in rows")
+    parser.add_argument('--categories', type=int, default=8, help="number of distinct categories")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument('-o', '--output', default='bench_results.json', help="JSON results file")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="model used for the prediction benchmarks")
+    parser.add_argument('--no-predict', action='store_true', help="skip the prediction benchmarks")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help="compare two result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args.sizes, args.categories, args.repeat, args.output, args.model, not args.no_predict)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
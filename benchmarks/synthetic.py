@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+# Words descriptions are built from; a few hundred distinct strings like real exports
+_DESCRIPTION_WORDS = ['Payment', 'Purchase', 'Refund', 'Transfer', 'Subscription', 'Invoice',
+                      'Online', 'Store', 'Monthly', 'Card', 'Cash', 'Fee']
+
+
+def generate_ledger(rows, categories=8, days=3 * 365, start='2020-01-01', seed=0):
+    """A random ledger with the columns the app imports: Date/Category/Amount/Currency/Description.
+
+    Dates are spread uniformly over ``days`` days and left unsorted, like
+    concatenated exports; amounts follow a skewed (gamma) distribution with
+    a different scale per category.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([f'Category {i:03d}' for i in range(categories)])
+    category_codes = rng.integers(0, categories, rows)
+    scales = rng.uniform(10, 200, categories)
+
+    descriptions = np.array([f'{a} {b}' for a in _DESCRIPTION_WORDS for b in _DESCRIPTION_WORDS])
+    return pd.DataFrame({
+        'Date': pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit='D'),
+        'Category': names[category_codes],
+        'Amount': (rng.gamma(2.0, 1.0, rows) * scales[category_codes]).round(2),
+        'Currency': rng.choice(['USD', 'EUR', 'GBP'], rows, p=[0.8, 0.15, 0.05]),
+        'Description': descriptions[rng.integers(0, len(descriptions), rows)],
+    })
+
+
+def write_ledger(data, path):
+    """Write a ledger as CSV or XLSX, chosen by the file extension."""
+    if path.endswith('.csv'):
+        data.to_csv(path, index=False, date_format='%Y-%m-%d')
+    else:
+        data.to_excel(path, index=False, engine='openpyxl')
+    return path
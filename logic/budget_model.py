@@ -0,0 +1,147 @@
+import bisect
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionProgressBar
+
+# Roles the delegate reads besides DisplayRole (the category name)
+BudgetRole = Qt.UserRole + 1
+SpentRole = Qt.UserRole + 2
+
+# Height of every row; a fixed height lets the list view skip measuring rows
+ROW_HEIGHT = 56
+
+
+class BudgetListModel(QAbstractListModel):
+    """One row per category with its monthly budget and the amount spent so far.
+
+    Changing one category's budget or spending emits ``dataChanged`` for that
+    row only, so the view repaints a single row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Categories in display (sorted) order, and each one's row
+        self._categories = []
+        self._rows = {}
+        self._budgets = {}
+        self._spent = {}
+
+    def set_budgets(self, categories, budgets, spent):
+        """Replace every row: ``categories`` in order, with ``{category: amount}`` budgets and spending."""
+        self.beginResetModel()
+        self._categories = sorted(set(categories) | set(budgets) | set(spent))
+        self._rows = {category: row for row, category in enumerate(self._categories)}
+        self._budgets = dict(budgets)
+        self._spent = dict(spent)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._categories)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        category = self._categories[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return category
+        if role == BudgetRole:
+            return self._budgets.get(category, 0)
+        if role == SpentRole:
+            return self._spent.get(category, 0)
+        if role == Qt.ToolTipRole:
+            return f"{category}: spent {self.spent(category):,.2f} of {self.budget(category):,.2f}"
+        return None
+
+    def category(self, row):
+        return self._categories[row]
+
+    def row_of(self, category):
+        """Row of ``category``, or -1 if it has no row."""
+        return self._rows.get(category, -1)
+
+    def budget(self, category):
+        return self._budgets.get(category, 0)
+
+    def spent(self, category):
+        return self._spent.get(category, 0)
+
+    def _ensure_row(self, category):
+        """Insert a row for a new category at its sorted position."""
+        if category in self._rows:
+            return
+        row = bisect.bisect_left(self._categories, category)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._categories.insert(row, category)
+        self._rows = {name: i for i, name in enumerate(self._categories)}
+        self.endInsertRows()
+
+    def add_spent(self, category, amount):
+        self._ensure_row(category)
+        self._spent[category] = self._spent.get(category, 0) + amount
+        self.update_row(category)
+
+    def set_budget(self, category, amount):
+        self._ensure_row(category)
+        self._budgets[category] = amount
+        self.update_row(category)
+
+    def update_row(self, category):
+        """Tell views that one category's row changed."""
+        row = self.row_of(category)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [BudgetRole, SpentRole])
+
+
+class BudgetDelegate(QStyledItemDelegate):
+    """Paints a budget row: category name, remaining/spent text and a progress bar.
+
+    Rows are painted on demand, so only the visible ones cost anything, and
+    no widgets exist per category.
+    """
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        category = index.data(Qt.DisplayRole)
+        budget = index.data(BudgetRole)
+        spent = index.data(SpentRole)
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+
+        painter.save()
+        selected = bool(option.state & QStyle.State_Selected)
+        if selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        text_color = option.palette.highlightedText().color() if selected else option.palette.text().color()
+        rect = option.rect.adjusted(10, 6, -10, -6)
+        text_rect = QRect(rect.left(), rect.top(), rect.width(), 20)
+
+        # Category name on the left
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(text_color)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, category)
+
+        # Remaining and spent on the right, in red once the budget is exceeded
+        painter.setFont(option.font)
+        if budget:
+            text = f"Remaining: {budget - spent:g} - Spent: {spent:g}"
+        else:
+            text = f"No budget - Spent: {spent:g}"
+        if budget and spent > budget:
+            painter.setPen(QColor('red'))
+        painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, text)
+
+        # Progress bar drawn by the widget style, as QProgressBar would
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(rect.left(), rect.top() + 24, rect.width(), 16)
+        bar.minimum = 0
+        bar.maximum = max(int(budget), 1)
+        bar.progress = min(int(spent), bar.maximum) if budget else 0
+        bar.textVisible = False
+        bar.state = QStyle.State_Enabled | QStyle.State_Horizontal
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter, widget)
+        painter.restore()
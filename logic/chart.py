@@ -1,37 +1,65 @@
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import pandas as pd
+from logic.figures import ChartFigure
+from logic.perf import span
 
 class ChartCanvas(FigureCanvas):
-    """A canvas for embedding matplotlib charts in PySide6 UI."""
+    """A canvas for embedding matplotlib charts in PySide6 UI.
+
+    Drawing is done by a ``ChartFigure`` (logic/figures.py), which updates
+    its artists in place; the canvas supplies ``draw_idle`` for redraws and
+    its own width for downsampling, and re-downsamples lines on resize.
+    """
     def __init__(self, width=5, height=4, dpi=100):
-        self.fig, self.ax = plt.subplots(figsize=(width, height), dpi=dpi)
+        self.chart = ChartFigure(width, height, dpi, redraw=self._redraw, pixel_width=self._plot_width)
+        self.fig = self.chart.fig
+        self.ax = self.chart.ax
         super().__init__(self.fig)
 
-    def plot_line_chart(self, df: pd.DataFrame, x_column: str, y_column: str, title: str = "Line Chart"):
-        """Plot a line chart with the given data."""
-        self.ax.clear()
-        self.ax.plot(df[x_column], df[y_column], marker='o')
-        self.ax.set_title(title)
-        self.ax.set_xlabel(x_column)
-        self.ax.set_ylabel(y_column)
-        self.draw()
+    def _redraw(self):
+        self.draw_idle()
+
+    def _plot_width(self):
+        return self.width()
+
+    def draw(self):
+        """Render the figure; draw_idle ends up here once per event loop pass."""
+        with span('render figure', 'render'):
+            super().draw()
+
+    def resizeEvent(self, event):
+        """Re-downsample the line for the new width when the canvas is resized."""
+        super().resizeEvent(event)
+        old_width = event.oldSize().width()
+        if old_width > 0 and abs(self.width() - old_width) > 0.2 * old_width:
+            self.chart.refresh_line()
+
+    def update_line(self, *args, **kwargs):
+        """See ChartFigure.update_line."""
+        self.chart.update_line(*args, **kwargs)
+
+    def update_bars(self, *args, **kwargs):
+        """See ChartFigure.update_bars."""
+        self.chart.update_bars(*args, **kwargs)
+
+    def update_pie(self, *args, **kwargs):
+        """See ChartFigure.update_pie."""
+        self.chart.update_pie(*args, **kwargs)
+
+    def clear_chart(self, *args, **kwargs):
+        """See ChartFigure.clear_chart."""
+        self.chart.clear_chart(*args, **kwargs)
+
+    def plot_line_chart(self, df: pd.DataFrame, x_column: str, y_column: str, title: str = "Line Chart",
+                        downsample: str = None):
+        """Plot a line chart with the given data, optionally downsampled ('lttb' or 'minmax')."""
+        self.update_line(df[x_column], df[y_column], title, x_column, y_column, marker='o',
+                         downsample=downsample)
 
     def plot_bar_chart(self, df: pd.DataFrame, x_column: str, y_column: str, title: str = "Bar Chart"):
         """Plot a bar chart with the given data."""
-        self.ax.clear()
-        self.ax.bar(df[x_column], df[y_column], color='skyblue')
-        self.ax.set_title(title)
-        self.ax.set_xlabel(x_column)
-        self.ax.set_ylabel(y_column)
-        self.draw()
+        self.update_bars(df[x_column], df[y_column], title, x_column, y_column)
 
     def plot_pie_chart(self, df: pd.DataFrame, labels_column: str, values_column: str, title: str = "Pie Chart"):
         """Plot a pie chart with the given data."""
-        self.ax.clear()
-        labels = df[labels_column]
-        values = df[values_column]
-        self.ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
-        self.ax.set_title(title)
-        self.ax.axis('equal')  # Equal aspect ratio to ensure the pie is drawn as a circle
-        self.draw()
+        self.update_pie(df[labels_column], df[values_column], title)
@@ -0,0 +1,81 @@
+import numpy as np
+
+# Methods accepted by downsample()
+METHODS = ('lttb', 'minmax')
+
+
+def _as_float(x):
+    """View x values (numbers or datetime64) as float64 for geometry."""
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each of ``n_out - 2`` buckets,
+    the point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves the visual shape and peaks.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of ``n_out // 2`` buckets, in order."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    indices = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        lo = start + int(np.argmin(bucket))
+        hi = start + int(np.argmax(bucket))
+        indices.extend(sorted({lo, hi}))
+    # Always keep the end points so the line spans the full range
+    return np.unique(np.concatenate([[0], indices, [n - 1]]))
+
+
+def downsample(x, y, n_out, method='lttb'):
+    """Reduce a series to about ``n_out`` points; returns the (x, y) arrays to plot."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == 'lttb':
+        indices = lttb_indices(x, y, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {METHODS}")
+    return x[indices], y[indices]
@@ -0,0 +1,109 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# How Amount is held in memory: 'float32', 'cents' (int64 cents) or 'float64'
+AMOUNT_STORAGES = ('float32', 'cents', 'float64')
+AMOUNT_STORAGE = os.environ.get("FINANCE_DASHBOARD_AMOUNT_STORAGE", "float32")
+if AMOUNT_STORAGE not in AMOUNT_STORAGES:
+    print(f"Unknown FINANCE_DASHBOARD_AMOUNT_STORAGE {AMOUNT_STORAGE!r}, using float64")
+    AMOUNT_STORAGE = 'float64'
+
+# float32 represents every cent exactly only below this magnitude (2**24 cents)
+FLOAT32_EXACT_LIMIT = 2 ** 24 / 100
+
+# Low-cardinality text columns stored as categoricals
+CATEGORICAL_COLUMNS = ['Category', 'Currency']
+
+# Free-text columns whose repeated strings are interned
+INTERNED_COLUMNS = ['Description']
+
+
+def amount_values(data):
+    """Amount as float64 dollars, whatever storage the frame uses.
+
+    Integer amounts only ever come out of ``normalize_frame`` in 'cents'
+    mode, so an integer Amount column is always in cents.
+    """
+    amounts = data['Amount']
+    values = amounts.to_numpy(dtype='float64', na_value=np.nan)
+    if pd.api.types.is_integer_dtype(amounts.dtype):
+        return values / 100
+    if amounts.dtype == np.float32:
+        # Widen to the nearest cent, so sums match the float64 amounts that were parsed
+        return np.round(values, 2)
+    return values
+
+
+def intern_strings(series):
+    """Object column in which equal strings share one interned object; missing values stay missing."""
+    codes, uniques = pd.factorize(series)
+    # Code -1 (missing) picks the trailing None
+    interned = np.array([sys.intern(str(value)) for value in uniques] + [None], dtype=object)
+    return pd.Series(interned[codes], index=series.index, name=series.name, dtype=object)
+
+
+def compact_amounts(amounts, storage=AMOUNT_STORAGE):
+    """Amounts in the configured storage; float32 is only used when it keeps every cent exact."""
+    amounts = pd.to_numeric(amounts, errors='coerce')
+    if storage == 'cents':
+        cents = (amounts.astype('float64') * 100).round()
+        # The nullable type (an extra mask byte per row) only when some amount is missing
+        return cents.astype('Int64' if cents.isna().any() else 'int64')
+    if storage == 'float32' and not (np.abs(amounts) >= FLOAT32_EXACT_LIMIT).any():
+        return amounts.astype('float32')
+    return amounts.astype('float64')
+
+
+def normalize_frame(data, storage=AMOUNT_STORAGE):
+    """Convert a parsed frame to the compact in-memory representation, in place.
+
+    Category and Currency become categoricals, Amount is stored as float32
+    or int64 cents (see AMOUNT_STORAGE) and Description strings are
+    interned. Already-normalized columns are left alone.
+    """
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype):
+            data[column] = data[column].astype('category')
+    if 'Amount' in data.columns:
+        data['Amount'] = compact_amounts(data['Amount'], storage)
+    for column in INTERNED_COLUMNS:
+        if column in data.columns and data[column].dtype == object:
+            data[column] = intern_strings(data[column])
+    return data
+
+
+def frame_memory(data):
+    """Bytes used by each column, counting each distinct Python object once.
+
+    ``DataFrame.memory_usage(deep=True)`` charges every cell of an object
+    column for its own string, even when cells share one interned object.
+    """
+    usage = {}
+    for column in data.columns:
+        series = data[column]
+        if series.dtype == object:
+            values = series.to_numpy()
+            ids = np.fromiter(map(id, values), dtype=np.int64, count=len(values))
+            _, first = np.unique(ids, return_index=True)
+            usage[column] = values.nbytes + sum(map(sys.getsizeof, values[first]))
+        else:
+            usage[column] = int(series.memory_usage(index=False, deep=True))
+    return usage
+
+
+def add_memory(total, usage):
+    """Add one ``frame_memory`` result into a running per-column total."""
+    for column, size in usage.items():
+        total[column] = total.get(column, 0) + size
+    return total
+
+
+def memory_report(before, after):
+    """Human-readable before/after memory per column, from two ``frame_memory`` results."""
+    lines = []
+    for column in after:
+        lines.append(f"{column:<12} {before.get(column, 0) / 2**20:10.1f} MB -> {after[column] / 2**20:8.1f} MB")
+    lines.append(f"{'Total':<12} {sum(before.values()) / 2**20:10.1f} MB -> {sum(after.values()) / 2**20:8.1f} MB")
+    return "\n".join(lines)
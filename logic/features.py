@@ -0,0 +1,152 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from logic.dtypes import amount_values
+from logic.lru import LRUCache
+
+# Previous amounts in the same category used as features
+LAGS = (1, 7)
+
+# Means over the previous N amounts in the same category
+ROLLING_WINDOWS = (7, 30)
+
+# Every feature the pipeline computes
+FEATURE_COLUMNS = [f'lag_{lag}' for lag in LAGS] + [f'rolling_{window}' for window in ROLLING_WINDOWS] + [
+    'day_of_week', 'month']
+
+# Feature matrices kept for recent dataset versions
+FEATURE_CACHE_SIZE = 2
+
+
+def _group_positions(groups):
+    """Position of each row within its run of equal ``groups`` values (0 for a run's first row)."""
+    rows = np.arange(len(groups))
+    starts = np.ones(len(groups), dtype=bool)
+    starts[1:] = groups[1:] != groups[:-1]
+    return rows - np.maximum.accumulate(np.where(starts, rows, 0))
+
+
+def grouped_lag(values, positions, lag):
+    """``values`` shifted down by ``lag`` rows within each group; NaN where a group has no such row."""
+    lagged = np.full(len(values), np.nan)
+    lagged[lag:] = values[:-lag] if lag else values
+    lagged[positions < lag] = np.nan
+    return lagged
+
+
+def grouped_rolling_mean(values, positions, window):
+    """Mean of up to ``window`` previous values in the same group (the current row excluded).
+
+    Uses one cumulative sum, so every row costs O(1) whatever the window.
+    """
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    rows = np.arange(len(values))
+    count = np.minimum(positions, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[rows] - sums[rows - count]) / count
+
+
+def build_features(data):
+    """Build lag, rolling and calendar features per category; returns a new frame in date order.
+
+    Rows are sorted by date and grouped by category, so ``lag_1`` is the
+    previous amount in the same category rather than the previous line of
+    the file. Rows without a full ``lag_7`` history are dropped, as are rows
+    missing a date or amount.
+    """
+    if 'Date' not in data.columns or 'Amount' not in data.columns:
+        raise ValueError("The file is missing required columns ('Date' and 'Amount').")
+
+    dates = data['Date'].to_numpy()
+    amounts = amount_values(data)
+    valid = ~(np.isnat(dates) | np.isnan(amounts))
+    if 'Category' in data.columns:
+        categories = pd.Categorical(data['Category'][valid])
+        codes = categories.codes
+    else:
+        categories = None
+        codes = np.zeros(int(valid.sum()), dtype=np.int8)
+    dates, amounts = dates[valid], amounts[valid]
+
+    # Chronological order, then each category's rows made contiguous (stable, so still chronological)
+    by_date = np.argsort(dates, kind='stable')
+    order = by_date[np.argsort(codes[by_date], kind='stable')]
+    values = amounts[order]
+    positions = _group_positions(codes[order])
+
+    columns = {}
+    for lag in LAGS:
+        columns[f'lag_{lag}'] = grouped_lag(values, positions, lag)
+    for window in ROLLING_WINDOWS:
+        columns[f'rolling_{window}'] = grouped_rolling_mean(values, positions, window)
+
+    # Back from category order to date order
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    take = rank[by_date]
+    take = take[positions[take] >= max(LAGS)]
+    if len(take) == 0:
+        raise ValueError("Processed data is empty after preprocessing.")
+
+    rows = order[take]
+    day = pd.DatetimeIndex(dates[rows])
+    features = pd.DataFrame({'Date': dates[rows], 'Amount': amounts[rows]})
+    if categories is not None:
+        features['Category'] = pd.Categorical.from_codes(codes[rows], categories.categories)
+    for column, column_values in columns.items():
+        features[column] = column_values[take]
+    features['day_of_week'] = day.dayofweek  # Day of the week (0=Monday, 6=Sunday)
+    features['month'] = day.month
+    return features
+
+
+def fit_scaler(features, columns):
+    """A StandardScaler fitted on ``features[columns]``; nothing is saved.
+
+    Only for models without a saved scaler. A model should be used with the
+    scaler it was trained behind (see ``ModelRegistry.current``).
+    """
+    # scikit-learn is imported here so opening the view does not pay for it
+    from sklearn.preprocessing import StandardScaler
+    return StandardScaler().fit(features[list(columns)])
+
+
+def scaler_columns(scaler):
+    """Feature columns ``scaler`` was fitted on, in order: the columns its model expects."""
+    return list(scaler.feature_names_in_)
+
+
+def read_scaler(path, columns=None):
+    """Load a scaler saved by ``write_scaler``.
+
+    Raises ValueError if ``columns`` is given and the scaler was fitted on other columns.
+    """
+    with open(path, 'rb') as f:
+        saved = pickle.load(f)
+    if columns is not None and saved['columns'] != list(columns):
+        raise ValueError(f"Scaler {path} was fitted on {saved['columns']}, expected {list(columns)}")
+    return saved['scaler']
+
+
+def write_scaler(scaler, columns, path):
+    """Save a fitted scaler with its column list, atomically."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'columns': list(columns), 'scaler': scaler}, f)
+    os.replace(tmp_path, path)
+
+
+_feature_cache = None
+
+
+def get_feature_cache():
+    """Return the application-wide cache of feature frames and scaled matrices.
+
+    Keys are ``(dataset version, model version)``, since each model version
+    has its own scaler; the model registry clears it when the version changes.
+    """
+    global _feature_cache
+    if _feature_cache is None:
+        _feature_cache = LRUCache(FEATURE_CACHE_SIZE)
+    return _feature_cache
@@ -0,0 +1,195 @@
+from matplotlib.figure import Figure
+import numpy as np
+from logic.downsample import downsample as downsample_series
+
+# Titles used for the period comparison charts, by rollup frequency
+PERIOD_TITLES = {'M': "Monthly Expenses", 'Y': "Yearly Expenses"}
+
+# Colors of the dashboard charts
+BAR_COLOR = '#3498db'
+LINE_COLOR = '#2980b9'
+DONUT_COLORS = ['#3498db', '#e74c3c', '#95a5a6']
+
+
+class ChartFigure:
+    """A matplotlib Figure with one Axes whose artists are updated in place.
+
+    This holds no Qt state, so the same drawing code runs inside the UI
+    (wrapped by ``logic.chart.ChartCanvas``) and headless on the Agg backend.
+    The figure is created outside pyplot's global registry. Each ``update_*``
+    method reuses the artists already on the axes (line data, bar heights,
+    wedge angles) and then calls ``redraw``; artists are only rebuilt when the
+    chart type or number of elements changes.
+    """
+
+    def __init__(self, width=5, height=4, dpi=100, redraw=None, pixel_width=None):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.ax = self.fig.add_subplot()
+        # Hooks supplied by a canvas; headless figures are drawn by savefig
+        self._redraw = redraw
+        self._pixel_width = pixel_width
+        # What is currently drawn, and the artists that can be updated in place
+        self._kind = None
+        self._artists = None
+        self._legend = None
+        # Arguments of the last downsampled update_line, replayed by refresh_line
+        self._line_args = None
+
+    def pixel_width(self):
+        """Width available for plotting, in pixels."""
+        if self._pixel_width is not None:
+            return self._pixel_width()
+        return int(self.fig.get_figwidth() * self.fig.dpi)
+
+    def redraw(self):
+        if self._redraw is not None:
+            self._redraw()
+
+    def _reset(self, kind):
+        """Clear the axes before building artists for a different chart."""
+        self.ax.clear()
+        self._kind = kind
+        self._artists = None
+        self._legend = None
+
+    def _set_labels(self, title, xlabel, ylabel):
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+
+    def update_line(self, x, y, title="Line Chart", xlabel="", ylabel="", color=None, marker=None,
+                    downsample=None):
+        """Draw or update a single line; string x values are placed at evenly spaced ticks.
+
+        With ``downsample`` set to 'lttb' or 'minmax', series longer than the
+        plot is wide are reduced to about one point per pixel before
+        plotting, and markers are dropped since they would overlap.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        categorical = x.dtype.kind in 'OUS'
+        self._line_args = None
+        if downsample and not categorical:
+            self._line_args = (x, y, title, xlabel, ylabel, color, marker, downsample)
+            target = max(self.pixel_width(), 100)
+            if len(x) > target:
+                x, y = downsample_series(x, y, target, downsample)
+                marker = None
+        positions = np.arange(len(x)) if categorical else x
+
+        kind = ('line', categorical)
+        if self._kind != kind:
+            self._reset(kind)
+            self._artists, = self.ax.plot(positions, y, color=color, marker=marker)
+        else:
+            self._artists.set_data(positions, y)
+            self._artists.set_marker(marker if marker is not None else '')
+        if categorical:
+            self.ax.set_xticks(positions, x)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._set_labels(title, xlabel, ylabel)
+        self.redraw()
+
+    def clear_chart(self, title="", message="No data"):
+        """Empty the axes, keeping the title and showing ``message`` in their middle."""
+        self._reset('empty')
+        self._line_args = None
+        self.ax.set_title(title)
+        self.ax.text(0.5, 0.5, message, ha='center', va='center', transform=self.ax.transAxes, color='gray')
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self.redraw()
+
+    def refresh_line(self):
+        """Re-run the last downsampled update_line, e.g. after the width changed."""
+        if self._line_args is not None:
+            self.update_line(*self._line_args)
+
+    def update_bars(self, labels, values, title="Bar Chart", xlabel="", ylabel="", color='skyblue', rotation=0):
+        """Draw or update a bar per label, reusing the bar patches when the count is unchanged."""
+        labels = [str(label) for label in labels]
+        values = np.asarray(values, dtype=float)
+        positions = np.arange(len(values))
+
+        if self._kind == 'bar' and len(self._artists) == len(values):
+            for bar, value in zip(self._artists, values):
+                bar.set_height(value)
+        else:
+            self._reset('bar')
+            self._artists = self.ax.bar(positions, values, color=color)
+        self.ax.set_xticks(positions, labels, rotation=rotation)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._set_labels(title, xlabel, ylabel)
+        self.redraw()
+
+    def update_pie(self, labels, values, title="Pie Chart", donut=False, colors=None, legend_title=None):
+        """Draw or update a pie (or donut) chart with a legend, moving the existing wedges."""
+        labels = [str(label) for label in labels]
+        values = np.asarray(values, dtype=float)
+
+        kind = ('pie', donut)
+        if self._kind == kind and len(self._artists) == len(values):
+            total = values.sum()
+            fractions = values / total if total else np.zeros_like(values)
+            # Same layout ax.pie uses: counter-clockwise from a start angle of 90 degrees
+            angles = 90 + 360 * np.concatenate([[0.0], np.cumsum(fractions)])
+            for wedge, theta1, theta2 in zip(self._artists, angles[:-1], angles[1:]):
+                wedge.set_theta1(theta1)
+                wedge.set_theta2(theta2)
+            for text, label in zip(self._legend.get_texts(), labels):
+                text.set_text(label)
+        else:
+            self._reset(kind)
+            wedgeprops = dict(width=0.4) if donut else None
+            self._artists, _ = self.ax.pie(values, wedgeprops=wedgeprops, startangle=90, colors=colors)
+            self._legend = self.ax.legend(self._artists, labels, title=legend_title,
+                                          loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+        self.ax.set(aspect="equal", title=title)
+        self.redraw()
+
+
+def plot_category_bars(chart, rollup):
+    """Bar chart of total expenses by category."""
+    categories = rollup.category_totals()
+    chart.update_bars(categories.index, categories.values, 'Expenses by Category',
+                      ylabel='Amount ($)', color=BAR_COLOR, rotation=90)
+
+
+def plot_category_donut(chart, rollup):
+    """Donut chart of total expenses by category."""
+    sizes = rollup.category_totals()
+    chart.update_pie(sizes.index, sizes.values, 'Expenses by Category', donut=True,
+                     colors=DONUT_COLORS, legend_title="Category")
+
+
+def plot_daily_line(chart, rollup):
+    """Line chart of daily expenses, downsampled to the chart width."""
+    daily_expenses = rollup.period_totals('D')
+    chart.update_line(daily_expenses.index.to_numpy(), daily_expenses.values,
+                      'Daily Expenses Over Time', ylabel='Amount ($)',
+                      color=LINE_COLOR, marker='o', downsample='lttb')
+
+
+def plot_period_comparison(line_chart, bar_chart, df, x_column, y_column, title):
+    """Line and bar chart of a period comparison table (see RollupCube.period_table)."""
+    line_chart.update_line(df[x_column], df[y_column], f"{title} (Line Chart)", x_column, y_column, marker='o')
+    bar_chart.update_bars(df[x_column], df[y_column], f"{title} (Bar Chart)", x_column, y_column)
+
+
+def plot_predictions(chart, dates, predicted):
+    """Line chart of predicted expenses, downsampled to the chart width."""
+    chart.update_line(dates, predicted, 'Predicted Expenses', ylabel='Amount ($)',
+                      color=LINE_COLOR, downsample='lttb')
+
+
+def plot_forecast(chart, forecast, freq):
+    """Forecast total across categories: a line over days, or a bar per month."""
+    totals = forecast.groupby('Date', sort=True)['Predicted'].sum()
+    if freq == 'M':
+        chart.update_bars(totals.index.astype(str), totals.to_numpy(), 'Forecast Expenses by Month',
+                          ylabel='Amount ($)', color=BAR_COLOR, rotation=45)
+    else:
+        chart.update_line(totals.index.to_numpy(), totals.to_numpy(), 'Forecast Daily Expenses',
+                          ylabel='Amount ($)', color=LINE_COLOR, downsample='lttb')
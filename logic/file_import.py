@@ -1,14 +1,297 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+from logic.dtypes import add_memory, amount_values, frame_memory, normalize_frame
+from logic.ingest_cache import get_ingest_cache
+from logic.perf import span
 
-def import_excel(file_path):
-    """Function to import and read Excel or CSV data."""
+# Rows parsed per chunk when streaming CSV files; bounds peak memory during import
+CSV_CHUNK_SIZE = 200_000
+
+# Explicit dtypes so pandas never has to infer (or widen to object) per chunk
+CSV_DTYPES = {'Category': 'category', 'Currency': 'category', 'Description': 'object'}
+
+# Files picked up when a folder is imported
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+
+# Columns that identify a transaction when deduplicating overlapping exports
+DEDUP_COLUMNS = ['Date', 'Category', 'Amount', 'Description']
+
+# Most processes used to parse files in parallel
+IMPORT_MAX_WORKERS = 8
+
+
+def import_excel(file_path, use_cache=True, progress=None):
+    """Function to import and read Excel or CSV data.
+
+    Parsed files are kept in a columnar on-disk cache, so re-opening an
+    unchanged file skips the CSV/openpyxl parse entirely. CSV files are
+    streamed in chunks; ``progress(done_bytes, total_bytes, message)`` is
+    called after each one. Columns are converted to the compact dtypes of
+    ``logic.dtypes.normalize_frame``; the per-column memory before and after
+    is left in ``data.attrs['memory']``.
+    """
     try:
+        cache = get_ingest_cache() if use_cache else None
+        if cache is not None:
+            with span('cache read', 'import') as cache_span:
+                data = cache.get(file_path)
+                cache_span['rows'] = len(data) if data is not None else None
+            if data is not None:
+                return data
+
         if file_path.endswith('.csv'):
-            data = pd.read_csv(file_path)
+            with span('parse csv', 'import') as parse_span:
+                data = import_csv_chunked(file_path, progress=progress)
+                parse_span['rows'] = len(data)
         else:
-            # Specify 'openpyxl' as the engine for reading .xlsx files
-            data = pd.read_excel(file_path, engine='openpyxl')
+            with span('parse xlsx', 'import') as parse_span:
+                # Specify 'openpyxl' as the engine for reading .xlsx files
+                data = pd.read_excel(file_path, engine='openpyxl')
+                parse_span['rows'] = len(data)
+            memory = {'before': {}, 'after': {}}
+            data = compact_chunk(data, memory)
+            data.attrs['memory'] = memory
+
+        if cache is not None:
+            with span('cache write', 'import', rows=len(data)):
+                cache.put(file_path, data)
         return data
     except Exception as e:
         print(f"Error importing file: {e}")
         return None
+
+
+def import_csv_chunked(file_path, chunksize=CSV_CHUNK_SIZE, progress=None):
+    """Stream a CSV file in chunks, coercing each one before it is kept.
+
+    Only the coerced column arrays of each chunk are retained, so peak memory
+    is roughly one raw chunk plus the compacted result.
+    """
+    total_bytes = os.path.getsize(file_path)
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtypes = {column: dtype for column, dtype in CSV_DTYPES.items() if column in header}
+
+    chunks = []
+    rows = 0
+    memory = {'before': {}, 'after': {}}
+    with open(file_path, 'rb') as f:
+        for chunk in pd.read_csv(f, chunksize=chunksize, dtype=dtypes):
+            chunk = compact_chunk(chunk, memory)
+            rows += len(chunk)
+            # Keep plain column arrays so the raw chunk frame can be freed
+            chunks.append({column: chunk[column] for column in chunk.columns})
+            del chunk
+            if progress is not None:
+                progress(f.tell(), total_bytes, _progress_message(f.tell(), total_bytes, rows))
+
+    if progress is not None:
+        progress(total_bytes, total_bytes, _progress_message(total_bytes, total_bytes, rows))
+    if not chunks:
+        return pd.DataFrame(columns=header)
+    data = concat_columns(chunks)
+    data.attrs['memory'] = memory
+    return data
+
+
+def _progress_message(done_bytes, total_bytes, rows):
+    return f"{done_bytes / 1024 ** 2:,.1f} / {total_bytes / 1024 ** 2:,.1f} MB, {rows:,} rows"
+
+
+def coerce_chunk(chunk):
+    """Coerce Date, Category and Amount of a freshly parsed chunk."""
+    if 'Date' in chunk.columns:
+        chunk['Date'] = pd.to_datetime(chunk['Date'], errors='coerce')
+    if 'Amount' in chunk.columns:
+        chunk['Amount'] = pd.to_numeric(chunk['Amount'], errors='coerce')
+    if 'Category' in chunk.columns and not isinstance(chunk['Category'].dtype, pd.CategoricalDtype):
+        chunk['Category'] = chunk['Category'].astype('category')
+    return chunk
+
+
+def compact_chunk(chunk, memory=None):
+    """Coerce a parsed chunk and convert it to compact dtypes.
+
+    With ``memory`` (a dict of 'before'/'after' totals) the chunk's
+    per-column memory before and after is added to it.
+    """
+    with span('coerce types', 'import', rows=len(chunk)):
+        before = frame_memory(chunk) if memory is not None else None
+        chunk = normalize_frame(coerce_chunk(chunk))
+        if memory is not None:
+            add_memory(memory['before'], before)
+            add_memory(memory['after'], frame_memory(chunk))
+    return chunk
+
+
+def concat_columns(chunks):
+    """Concatenate per-chunk column dicts one column at a time.
+
+    Categorical columns are merged with union_categoricals so they stay
+    categorical even when chunks saw different categories. Each column is
+    released from the chunks as soon as it has been concatenated.
+    """
+    columns = {}
+    for column in list(chunks[0]):
+        parts = [chunk.pop(column) for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            # An all-missing part (a file without the column) has object categories; give it the others' type
+            reference = next((part.cat.categories for part in parts if len(part.cat.categories)), None)
+            if reference is not None:
+                parts = [part if len(part.cat.categories) else part.cat.set_categories(reference[:0])
+                         for part in parts]
+            columns[column] = pd.Series(union_categoricals(parts))
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+        del parts
+    return pd.DataFrame(columns)
+
+
+def read_transactions(file_path, progress=None):
+    """Parse a file and coerce its columns; safe to run on a worker thread or process."""
+    data = import_excel(file_path, progress=progress)
+    if data is None:
+        raise ValueError(f"Could not read {file_path}")
+    if 'Date' in data.columns:
+        # Ensure the 'Date' column is in datetime format once, for every view
+        with span('coerce types', 'import', rows=len(data)):
+            data['Date'] = pd.to_datetime(data['Date'])
+    return data
+
+
+def expand_paths(paths):
+    """Expand folders into the CSV/Excel files they contain, keeping order and dropping duplicates."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(IMPORT_EXTENSIONS):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(f) for f in files))
+
+
+def _read_file_timed(file_path):
+    """Process-pool worker: parse one file, returning ``(data, seconds, error)``."""
+    started = time.perf_counter()
+    try:
+        data = read_transactions(file_path)
+        return data, time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, str(e)
+
+
+def import_files(file_paths, workers=None, progress=None):
+    """Parse many files in parallel and combine them into one deduplicated frame.
+
+    Files are parsed across a process pool (each worker uses the ingest
+    cache, as a single import does) and concatenated in the order given,
+    whatever order they finish in. ``progress(done_files, total_files,
+    message)`` is called as each file completes. Returns the frame and a
+    report with per-file rows, seconds and errors, and the number of
+    duplicate rows dropped.
+    """
+    started = time.perf_counter()
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(file_paths), IMPORT_MAX_WORKERS)
+
+    results = [None] * len(file_paths)
+    done = 0
+
+    def record(i, result):
+        nonlocal done
+        results[i] = result
+        done += 1
+        if progress is not None:
+            data, seconds, error = result
+            name = os.path.basename(file_paths[i])
+            status = f"failed ({error})" if error else f"{len(data):,} rows in {seconds:.1f} s"
+            progress(done, len(file_paths), f"{name}: {status}")
+
+    if workers <= 1:
+        for i, file_path in enumerate(file_paths):
+            record(i, _read_file_timed(file_path))
+    else:
+        # Spawned, not forked: imports run on a worker thread of a multithreaded Qt process
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = {executor.submit(_read_file_timed, file_path): i for i, file_path in enumerate(file_paths)}
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+        finally:
+            # On cancellation, drop the files that have not started yet
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    files = [{'file': file_path, 'rows': len(data) if data is not None else 0, 'seconds': seconds, 'error': error}
+             for file_path, (data, seconds, error) in zip(file_paths, results)]
+    frames = [data for data, _, _ in results if data is not None]
+    if not frames:
+        raise ValueError("None of the selected files could be read.")
+
+    memory = {'before': {}, 'after': {}}
+    for frame in frames:
+        for stage in memory:
+            add_memory(memory[stage], frame.attrs.get('memory', {}).get(stage, {}))
+
+    with span('deduplicate', 'import', rows=sum(len(frame) for frame in frames)):
+        data, duplicates = drop_overlapping_rows(frames)
+    data.attrs['memory'] = memory
+    report = {'files': files, 'rows': len(data), 'duplicates': duplicates,
+              'seconds': time.perf_counter() - started}
+    return data, report
+
+
+def concat_frames(frames):
+    """Concatenate parsed files into one frame with a consistent schema.
+
+    Columns are the union of every file's columns, in first-seen order. A
+    column that is categorical in any file is categorical in the result,
+    with the categories of all files merged.
+    """
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    chunks = []
+    for frame in frames:
+        chunk = {}
+        for column in columns:
+            # A file without the column contributes missing values
+            chunk[column] = frame[column] if column in frame.columns else pd.Series([None] * len(frame))
+        chunks.append(chunk)
+    for column in columns:
+        if any(isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks):
+            for chunk in chunks:
+                if not isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                    chunk[column] = chunk[column].astype('category')
+    return concat_columns(chunks)
+
+
+def drop_overlapping_rows(frames):
+    """Concatenate frames, dropping rows that an earlier frame already contains.
+
+    Rows are compared by a vectorized 64-bit hash of DEDUP_COLUMNS. Repeats
+    within one file are kept (two identical coffees on the same day are two
+    transactions): the n-th copy of a row is only dropped when an earlier
+    file also had at least n copies. Returns the frame and the number of
+    rows dropped.
+    """
+    data = concat_frames(frames)
+    columns = [column for column in DEDUP_COLUMNS if column in data.columns]
+    if not columns or len(frames) < 2:
+        return data, 0
+
+    keys = data[columns]
+    if 'Amount' in columns:
+        # Compare whole cents, so float32 and float64 copies of an amount hash alike
+        keys = keys.assign(Amount=np.round(amount_values(data) * 100))
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    file_ids = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    # Number each copy of a row within its own file: 0 for the first, 1 for the second...
+    occurrence = pd.Series(hashes).groupby([file_ids, hashes]).cumcount().to_numpy()
+    duplicated = pd.DataFrame({'hash': hashes, 'occurrence': occurrence}).duplicated(keep='first').to_numpy()
+    if not duplicated.any():
+        return data, 0
+    return data[~duplicated].reset_index(drop=True), int(duplicated.sum())
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from logic.features import LAGS, ROLLING_WINDOWS, build_features, fit_scaler, scaler_columns
+from logic.lru import LRUCache
+from logic.perf import span
+from logic.prediction import FEATURES
+
+# Forecast granularities: daily, or daily steps summed per calendar month
+FORECAST_FREQS = {'D': "days", 'M': "months"}
+
+# Days of history the lag and rolling features reach back
+HISTORY_DAYS = max(LAGS + ROLLING_WINDOWS)
+
+# Forecasts kept for recent (dataset version, horizon, granularity) keys
+FORECAST_CACHE_SIZE = 16
+
+
+def daily_totals(rollup):
+    """A copy of the cube's daily totals per (Date, Category), safe to hand to a worker thread.
+
+    The cube is updated in place by appends on the UI thread, so take this
+    snapshot there.
+    """
+    if rollup.is_empty():
+        raise ValueError("Load transactions before forecasting.")
+    return rollup.levels['D']['sum'].copy()
+
+
+def forecast_history(daily, days=HISTORY_DAYS):
+    """The last ``days`` daily totals per category from ``daily_totals``.
+
+    Returns ``(last_date, categories, history)`` where ``history`` is a
+    days x categories array; days without spending are zero, as in training.
+    """
+    dates = daily.index.get_level_values('Date')
+    last_date = dates.max()
+    window = pd.date_range(end=last_date, periods=days, freq='D')
+    recent = daily[dates >= window[0]].unstack('Category', fill_value=0)
+    categories = daily.index.get_level_values('Category').unique().sort_values()
+    recent = recent.reindex(index=window, columns=categories, fill_value=0)
+    return last_date, categories, recent.to_numpy(dtype='float64')
+
+
+def forecast_dates(last_date, horizon, freq='D'):
+    """Days to roll forward and the periods reported, for ``horizon`` days or months after ``last_date``.
+
+    A monthly forecast covers the ``horizon`` calendar months after the last
+    observed one; the rest of the current month is rolled through but not
+    reported.
+    """
+    if freq == 'M':
+        month = last_date.to_period('M')
+        end = (month + horizon).end_time.normalize()
+        days = pd.date_range(last_date + pd.Timedelta(days=1), end, freq='D')
+        return days, pd.period_range(month + 1, periods=horizon, freq='M')
+    days = pd.date_range(last_date + pd.Timedelta(days=1), periods=horizon, freq='D')
+    return days, days
+
+
+def roll_forward(model, scaler, history, days):
+    """Predict each of ``days`` for every category, one vectorized ``predict`` per step.
+
+    Each step's predictions become later steps' lags and rolling means.
+    The model's columns are those of ``scaler``; ``history`` must cover the
+    longest of them (``HISTORY_DAYS``). Returns a len(days) x categories array.
+    """
+    columns = scaler_columns(scaler)
+    depth = len(history)
+    count = history.shape[1]
+    buffer = np.vstack([history, np.zeros((len(days), count))])
+    day_of_week = days.dayofweek.to_numpy()
+    month = days.month.to_numpy()
+    for step in range(len(days)):
+        row = depth + step
+        values = {f'lag_{lag}': buffer[row - lag] for lag in LAGS}
+        for window in ROLLING_WINDOWS:
+            values[f'rolling_{window}'] = buffer[row - window:row].mean(axis=0)
+        values['day_of_week'] = np.full(count, day_of_week[step])
+        values['month'] = np.full(count, month[step])
+        X = np.column_stack([values[column] for column in columns])
+        # Same transform as StandardScaler.transform, without its per-call validation
+        buffer[row] = model.predict((X - scaler.mean_) / scaler.scale_)
+    return buffer[depth:]
+
+
+def forecast(model, daily, horizon, freq='D', scaler=None):
+    """Forecast ``horizon`` days or months per category as a Date/Category/Predicted frame.
+
+    ``daily`` holds the observed daily totals per (Date, Category), see
+    ``daily_totals``; ``scaler`` is the one ``model`` was trained with.
+    """
+    if freq not in FORECAST_FREQS:
+        raise ValueError(f"Unknown forecast granularity {freq!r}")
+    last_date, categories, history = forecast_history(daily)
+    days, periods = forecast_dates(last_date, horizon, freq)
+
+    if scaler is None:
+        scaler = fit_scaler(build_features(daily.rename('Amount').reset_index()), FEATURES)
+
+    with span('forecast', 'predict', rows=len(days) * len(categories)):
+        predicted = roll_forward(model, scaler, history, days)
+
+    result = pd.DataFrame(predicted, index=days, columns=categories)
+    if freq == 'M':
+        result = result.groupby(days.to_period('M')).sum().reindex(periods, fill_value=0)
+    result = result.rename_axis(index='Date', columns='Category').stack().rename('Predicted').reset_index()
+    return result
+
+
+_forecast_cache = None
+
+
+def get_forecast_cache():
+    """Return the application-wide cache of forecasts keyed by (dataset version, horizon, granularity)."""
+    global _forecast_cache
+    if _forecast_cache is None:
+        _forecast_cache = LRUCache(FORECAST_CACHE_SIZE)
+    return _forecast_cache
+
+
+def run_forecast(model, daily, horizon, freq='D', version=None, progress=None, scaler=None):
+    """Forecast via ``forecast``, cached by ``(version, horizon, freq)`` when a version is given."""
+    key = (version, horizon, freq)
+    if version is not None:
+        result = get_forecast_cache().get(key)
+        if result is not None:
+            return result
+    if progress is not None:
+        progress(0, 1, f"Forecasting {horizon} {FORECAST_FREQS.get(freq, freq)}...")
+    result = forecast(model, daily, horizon, freq, scaler)
+    if version is not None:
+        get_forecast_cache().put(key, result)
+    return result
@@ -0,0 +1,167 @@
+import numpy as np
+
+# Rows traversed at once; bounds the rows x trees node-index matrix (~8 MB for 200 trees)
+TRAVERSAL_BATCH = 10_000
+
+# Larger batches are handed back to model.predict, whose compiled per-tree loop wins
+# once there are enough rows to amortize its overhead (measured crossover ~1,500 rows)
+COMPILED_MAX_ROWS = 1_000
+
+# Largest relative difference from model.predict accepted when validating
+VALIDATION_RTOL = 1e-9
+
+
+class CompiledForest:
+    """A fitted tree ensemble flattened into NumPy node arrays.
+
+    The nodes of every tree are concatenated into single ``feature``,
+    ``threshold``, ``children`` and ``value`` arrays, renumbered so that each
+    split's two children are adjacent: a row moves to ``children[node]``
+    when it goes left and ``children[node] + 1`` when it goes right.
+    Prediction walks all rows through all trees at once, one vectorized step
+    per tree level, instead of calling each estimator in Python. Leaves
+    point to themselves, so rows that reach a leaf early simply stay there.
+
+    With ``model`` set, batches over ``COMPILED_MAX_ROWS`` rows are scored by
+    ``model.predict`` instead.
+    """
+
+    def __init__(self, feature, threshold, children, value, roots, n_features, max_depth, model=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+        self.max_depth = max_depth
+        self.model = model
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a single-output scikit-learn forest (or single tree) regressor.
+
+        Raises TypeError for models that are not tree ensembles.
+        """
+        estimators = getattr(model, 'estimators_', None)
+        if estimators is None:
+            estimators = [model]
+        trees = [getattr(estimator, 'tree_', None) for estimator in estimators]
+        if not trees or any(tree is None for tree in trees):
+            raise TypeError(f"{type(model).__name__} is not a tree ensemble")
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise TypeError("Only single-output tree models can be compiled")
+
+        total = sum(tree.node_count for tree in trees)
+        feature = np.zeros(total, dtype=np.intp)
+        # Leaves test feature 0 against +inf, so rows always "go left" back to the leaf itself
+        threshold = np.full(total, np.inf, dtype=np.float32)
+        children = np.zeros(total, dtype=np.intp)
+        value = np.zeros(total)
+        roots = []
+        offset = 0
+        for tree in trees:
+            left, right = tree.children_left, tree.children_right
+            # Breadth-first renumbering that gives each split's children consecutive numbers
+            order = [0]
+            for node in order:
+                if left[node] >= 0:
+                    order.extend((left[node], right[node]))
+            number = np.empty(tree.node_count, dtype=np.intp)
+            number[order] = np.arange(offset, offset + len(order))
+            for node in order:
+                new = number[node]
+                value[new] = tree.value[node, 0, 0]
+                if left[node] >= 0:
+                    feature[new] = tree.feature[node]
+                    threshold[new] = _float32_floor(tree.threshold[node])
+                    children[new] = number[left[node]]
+                else:
+                    children[new] = new
+            roots.append(offset)
+            offset += len(order)
+
+        return cls(feature[:offset], threshold[:offset], children[:offset], value[:offset],
+                   np.asarray(roots, dtype=np.intp), int(model.n_features_in_),
+                   max(tree.max_depth for tree in trees), model)
+
+    def predict(self, X):
+        """Mean prediction of all trees for each row of X."""
+        if self.model is not None and len(X) > COMPILED_MAX_ROWS:
+            return self.model.predict(X)
+        return self.predict_compiled(X)
+
+    def predict_compiled(self, X):
+        """Mean prediction of all trees for each row of X, always by the vectorized traversal."""
+        # scikit-learn also scores float32 copies of the inputs
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+        out = np.empty(len(X))
+        for start in range(0, len(X), TRAVERSAL_BATCH):
+            out[start:start + TRAVERSAL_BATCH] = self._predict_batch(X[start:start + TRAVERSAL_BATCH])
+        return out
+
+    def _predict_batch(self, X):
+        flat = np.ascontiguousarray(X).ravel()
+        # Offset of each row's features in ``flat``, broadcast against every tree
+        row_offsets = (np.arange(len(X)) * self.n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_right = flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[nodes] + go_right
+        return self.value[nodes].mean(axis=1)
+
+
+def _float32_floor(threshold):
+    """Largest float32 not above ``threshold``.
+
+    For float32 inputs ``x``, ``x <= threshold`` (compared in float64, as
+    scikit-learn does) holds exactly when ``x <= _float32_floor(threshold)``,
+    so traversal can stay in float32.
+    """
+    rounded = np.float32(threshold)
+    if rounded > threshold:
+        rounded = np.nextafter(rounded, np.float32(-np.inf))
+    return rounded
+
+
+def compile_model(model, sample=None):
+    """Compiled copy of a tree-ensemble model, validated against ``model.predict``.
+
+    Validation scores ``sample`` (or generated rows around the split
+    thresholds) with both and raises ValueError if they disagree.
+    """
+    compiled = CompiledForest.from_sklearn(model)
+    if sample is None:
+        sample = validation_sample(compiled)
+    expected = model.predict(sample)
+    actual = compiled.predict_compiled(sample)
+    if not np.allclose(actual, expected, rtol=VALIDATION_RTOL, atol=0):
+        worst = float(np.max(np.abs(actual - expected)))
+        raise ValueError(f"Compiled forest differs from model.predict by up to {worst:g}")
+    return compiled
+
+
+def validation_sample(compiled, rows=2_000, seed=0):
+    """Rows that exercise both sides of the splits: random values plus values at split thresholds."""
+    rng = np.random.default_rng(seed)
+    sample = rng.standard_normal((rows, compiled.n_features))
+    # Put each feature exactly on one of its split thresholds in half of the rows
+    splits = compiled.threshold[np.isfinite(compiled.threshold)]
+    split_features = compiled.feature[np.isfinite(compiled.threshold)]
+    if len(splits):
+        picks = rng.integers(0, len(splits), size=rows // 2)
+        sample[np.arange(rows // 2), split_features[picks]] = splits[picks]
+    return sample
+
+
+def predictor_for(model):
+    """The compiled forest for ``model`` when it can be compiled and validated, else the model itself."""
+    try:
+        return compile_model(model)
+    except TypeError:
+        # Not a forest; nothing to compile
+        return model
+    except Exception as e:
+        print(f"Error compiling model, using model.predict: {e}")
+        return model
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import pandas as pd
+from logic.dtypes import AMOUNT_STORAGE
+from logic.paths import APP_DATA_DIR
+
+# Total size the cache may grow to before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Bumped whenever the in-memory representation of a parsed file changes
+CACHE_FORMAT = 2
+
+
+class IngestCache:
+    """Columnar (Parquet) copies of imported files, keyed by path, size and mtime.
+
+    Re-opening an unchanged workbook reads the Parquet copy instead of going
+    through openpyxl again. Entries are evicted least recently used first once
+    the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.path.join(APP_DATA_DIR, "ingest_cache")
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, file_path):
+        """Cache key for a file: changes whenever the file is rewritten or the stored dtypes change."""
+        stat = os.stat(file_path)
+        raw = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{CACHE_FORMAT}|{AMOUNT_STORAGE}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, file_path):
+        """Return the cached frame for an unchanged file, or None on a miss."""
+        path = self._entry_path(self.key(file_path))
+        if not os.path.exists(path):
+            return None
+        try:
+            data = pd.read_parquet(path)
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        # Touch the entry so eviction treats it as recently used
+        os.utime(path)
+        return data
+
+    def put(self, file_path, data):
+        """Store a parsed frame for a file, then enforce the size limit."""
+        path = self._entry_path(self.key(file_path))
+        # Per-process name: report workers may cache the same file concurrently
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            data.to_parquet(tmp_path, index=False)
+            # Atomic rename so a crash never leaves a half-written entry behind
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Mixed-type object columns cannot always be stored; skip caching them
+            print(f"Could not cache {file_path}: {e}")
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every cached entry."""
+        for name in os.listdir(self.cache_dir):
+            self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache = None
+
+
+def get_ingest_cache():
+    """Return the application-wide ingest cache, or None if it cannot be created."""
+    global _cache
+    if _cache is None:
+        try:
+            _cache = IngestCache()
+        except OSError as e:
+            print(f"Ingest cache disabled: {e}")
+    return _cache
@@ -0,0 +1,185 @@
+import atexit
+import sqlite3
+import threading
+from logic.paths import app_data_path
+
+# Entries buffered before they are written in one transaction
+COMMIT_BATCH_SIZE = 100
+
+# Period keys are prefixes of the ISO date stored in each row
+PERIOD_LENGTHS = {'D': 10, 'M': 7, 'Y': 4}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,              -- ISO yyyy-mm-dd, so text order is date order
+    category TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,   -- exact sums, no float drift
+    currency TEXT NOT NULL DEFAULT 'USD',
+    description TEXT
+);
+-- Both indexes carry the amount, so range totals are answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date, category, amount_cents);
+CREATE INDEX IF NOT EXISTS idx_expenses_category_date ON expenses (category, date, amount_cents);
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    amount_cents INTEGER NOT NULL    -- monthly budget
+);
+"""
+
+# Budgets a new ledger starts with
+DEFAULT_BUDGETS = {'Groceries': 500, 'Rent': 1000, 'Utilities': 200}
+
+
+class Ledger:
+    """SQLite ledger of every manually entered expense.
+
+    The database runs in WAL mode, so reads never wait on a write. New
+    entries are buffered and written ``COMMIT_BATCH_SIZE`` at a time in a
+    single transaction; ``flush()`` writes the rest and every query flushes
+    first, so reads always see all entries. Totals are computed by SQLite
+    over the date and (category, date) indexes rather than in Python.
+    """
+
+    def __init__(self, path=None, batch_size=COMMIT_BATCH_SIZE):
+        self.path = path or app_data_path('ledger.db')
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = []
+        # Transactions are managed explicitly; the connection is shared across threads under the lock
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last commits on power loss, never corruption
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if not self._conn.execute("SELECT 1 FROM budgets LIMIT 1").fetchone():
+            self.set_budgets(DEFAULT_BUDGETS)
+
+    def add(self, date, category, amount, currency='USD', description=None):
+        """Record one expense; ``date`` is a 'yyyy-mm-dd' string."""
+        with self._lock:
+            self._pending.append((date, category, round(amount * 100), currency, description))
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def add_many(self, rows):
+        """Record many ``(date, category, amount, currency, description)`` rows in one transaction."""
+        with self._lock:
+            self._pending.extend((date, category, round(amount * 100), currency, description)
+                                 for date, category, amount, currency, description in rows)
+            self._write_pending()
+
+    def flush(self):
+        """Write any buffered entries."""
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO expenses (date, category, amount_cents, currency, description) VALUES (?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self._pending = []
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            self._write_pending()
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _date_filter(start, end, category=None):
+        """WHERE clause for a half-open [start, end) date range and optional category."""
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date < ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def spent_by_category(self, start=None, end=None):
+        """Total spent per category for dates in [start, end), as ``{category: amount}``."""
+        where, params = self._date_filter(start, end)
+        rows = self._query(f"SELECT category, SUM(amount_cents) FROM expenses{where} GROUP BY category", params)
+        return {category: cents / 100 for category, cents in rows}
+
+    def spent(self, category, start=None, end=None):
+        """Total spent in one category for dates in [start, end)."""
+        where, params = self._date_filter(start, end, category)
+        (cents,), = self._query(f"SELECT COALESCE(SUM(amount_cents), 0) FROM expenses{where}", params)
+        return cents / 100
+
+    def period_totals(self, freq='M', start=None, end=None):
+        """Totals per period ('D', 'M' or 'Y') and category, as ``(period, category, amount)`` rows."""
+        length = PERIOD_LENGTHS[freq]
+        where, params = self._date_filter(start, end)
+        rows = self._query(
+            f"SELECT substr(date, 1, {length}) AS period, category, SUM(amount_cents) FROM expenses{where} "
+            "GROUP BY period, category ORDER BY period, category",
+            params,
+        )
+        return [(period, category, cents / 100) for period, category, cents in rows]
+
+    def entries(self, start=None, end=None, category=None):
+        """Every entry in [start, end), oldest first, as ``(date, category, amount, currency, description)``."""
+        where, params = self._date_filter(start, end, category)
+        rows = self._query(
+            f"SELECT date, category, amount_cents, currency, description FROM expenses{where} ORDER BY date, id",
+            params,
+        )
+        return [(date, category, cents / 100, currency, description)
+                for date, category, cents, currency, description in rows]
+
+    def categories(self):
+        """Every category that has a budget or at least one entry, sorted."""
+        rows = self._query("SELECT category FROM budgets UNION SELECT DISTINCT category FROM expenses ORDER BY 1")
+        return [category for category, in rows]
+
+    def budgets(self):
+        """Monthly budget per category, as ``{category: amount}``."""
+        return {category: cents / 100
+                for category, cents in self._query("SELECT category, amount_cents FROM budgets")}
+
+    def set_budgets(self, budgets):
+        """Create or update the monthly budget of each category in ``{category: amount}``."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO budgets (category, amount_cents) VALUES (?, ?) "
+                "ON CONFLICT (category) DO UPDATE SET amount_cents = excluded.amount_cents",
+                [(category, round(amount * 100)) for category, amount in budgets.items()],
+            )
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+_ledger = None
+
+
+def get_ledger():
+    """Return the application-wide ledger, falling back to an in-memory one if the file cannot be opened."""
+    global _ledger
+    if _ledger is None:
+        try:
+            _ledger = Ledger()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error opening expense ledger, entries will not be saved: {e}")
+            _ledger = Ledger(':memory:')
+        # Write whatever is still buffered when the app exits
+        atexit.register(_ledger.close)
+    return _ledger
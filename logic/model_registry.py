@@ -0,0 +1,236 @@
+import json
+import os
+import re
+import threading
+from PySide6.QtCore import QFileSystemWatcher, QObject, Signal
+from logic.tasks import get_task_runner
+from logic.features import get_feature_cache, read_scaler, scaler_columns
+from logic.forest import predictor_for
+from logic.paths import app_data_path
+from logic.prediction import BUNDLED_SCALER, DEFAULT_MODEL_PATH, FEATURES, VERSION_SCALER, load_model_file
+
+# Name reported for the model shipped in prediction_expense_model/
+BUNDLED_VERSION = 'bundled'
+
+
+class ModelRegistry(QObject):
+    """Keeps the expense model resident and hands the same instance to every request.
+
+    The model is loaded once, in the background via ``load_async`` or on the
+    first ``get()``, and reloaded when the file on disk changes. If a
+    ``.joblib`` copy sits next to the pickle it is preferred, since joblib can
+    memory-map it instead of unpickling every array into RAM.
+
+    Retrained models are stored as numbered versions (``v0001``, ...) under
+    the app data directory, each with its scaler and ``metadata.json``. The
+    ``LATEST`` file names the active one and is replaced atomically, so the
+    registry only switches to a version once it is completely written.
+
+    Every version, the bundled one included, carries its own feature scaler,
+    which also records the model's feature columns. A model and its scaler are loaded together and handed out together by
+    ``current()``, so a prediction never pairs one version's model with
+    another's scaler.
+    """
+
+    # Emitted on the UI thread with the model after each (re)load
+    model_loaded = Signal(object)
+    # Emitted with an error message when a background load fails
+    load_failed = Signal(str)
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH):
+        super().__init__()
+        self.model_path = model_path
+        self._lock = threading.Lock()
+        self._model = None
+        self._scaler = None
+        self._loaded_version = None
+        self._loaded_path = None
+        self._loaded_mtime = None
+        # Compiled forest of the resident model, built on first use
+        self._predictor = None
+        self.latest_file = app_data_path('models', 'LATEST')
+        self.versions_dir = os.path.dirname(self.latest_file)
+
+        # Reload automatically when the model file is replaced
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watch(self.resolve_path())
+        self._watch(self.latest_file)
+
+    def active_version(self):
+        """Name of the active retrained version, or ``BUNDLED_VERSION``."""
+        try:
+            with open(self.latest_file) as f:
+                version = f.read().strip()
+        except OSError:
+            return BUNDLED_VERSION
+        if version and os.path.exists(os.path.join(self.versions_dir, version, 'model.joblib')):
+            return version
+        return BUNDLED_VERSION
+
+    def versions(self):
+        """Metadata of every stored version, oldest first, each with its ``version`` name."""
+        versions = []
+        for name in sorted(os.listdir(self.versions_dir)):
+            path = os.path.join(self.versions_dir, name, 'metadata.json')
+            if re.fullmatch(r'v\d+', name) and os.path.exists(path):
+                try:
+                    with open(path) as f:
+                        versions.append({'version': name, **json.load(f)})
+                except (OSError, ValueError) as e:
+                    print(f"Error reading model metadata {path}: {e}")
+        return versions
+
+    def metadata(self, version=None):
+        """Metadata of ``version`` (the active one by default); None for the bundled model."""
+        version = version or self.active_version()
+        return next((entry for entry in self.versions() if entry['version'] == version), None)
+
+    def resolve_path(self, version=None):
+        """Model file of ``version`` (the active one by default); the bundled model's .joblib sibling if present."""
+        version = version or self.active_version()
+        if version != BUNDLED_VERSION:
+            return os.path.join(self.versions_dir, version, 'model.joblib')
+        joblib_path = os.path.splitext(self.model_path)[0] + '.joblib'
+        if os.path.exists(joblib_path):
+            return joblib_path
+        return self.model_path
+
+    def scaler_path(self, version=None):
+        """Scaler file of ``version`` (the active one by default)."""
+        version = version or self.active_version()
+        if version != BUNDLED_VERSION:
+            return os.path.join(self.versions_dir, version, VERSION_SCALER)
+        return os.path.join(os.path.dirname(self.model_path), BUNDLED_SCALER)
+
+    def _watch(self, path):
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def is_loaded(self):
+        return self._model is not None
+
+    def _load(self):
+        """Make the active version's model and scaler resident (caller holds the lock)."""
+        version = self.active_version()
+        path = self.resolve_path(version)
+        mtime = os.path.getmtime(path)
+        if self._model is not None and (version, path, mtime) == (
+                self._loaded_version, self._loaded_path, self._loaded_mtime):
+            return
+        model = load_model_file(path)
+        scaler = self._load_scaler(version)
+        columns = scaler_columns(scaler)
+        if getattr(model, 'n_features_in_', len(columns)) != len(columns):
+            raise ValueError(f"Model {path} takes {model.n_features_in_} features, its scaler has {columns}")
+        if version != self._loaded_version:
+            # Cached feature matrices were scaled for the previous version
+            get_feature_cache().clear()
+        self._model, self._scaler, self._predictor = model, scaler, None
+        self._loaded_version, self._loaded_path, self._loaded_mtime = version, path, mtime
+
+    def _load_scaler(self, version):
+        path = self.scaler_path(version)
+        if version == BUNDLED_VERSION and not os.path.exists(path):
+            raise FileNotFoundError(f"{path} is missing; rebuild it with python -m logic.training --bundled-scaler")
+        # The bundled model takes FEATURES; a retrained version, whatever its scaler was fitted on
+        return read_scaler(path, FEATURES if version == BUNDLED_VERSION else None)
+
+    def get(self):
+        """Return the resident model, loading it on the calling thread if needed.
+
+        Safe to call from worker threads; concurrent callers wait for a single load.
+        """
+        with self._lock:
+            self._load()
+            return self._model
+
+    def predictor(self):
+        """Return the fastest validated predictor for the resident model.
+
+        For forests this is a ``CompiledForest`` (compiled and checked
+        against ``model.predict`` once per load), so small batches skip the
+        per-estimator overhead; other models are returned unchanged.
+        """
+        return self.current()[1]
+
+    def current(self):
+        """Return ``(version, predictor, scaler)`` of the resident model, loaded as one unit.
+
+        Use the scaler from the same call as the predictor; see ``predictor()``.
+        """
+        with self._lock:
+            self._load()
+            if self._predictor is None:
+                self._predictor = predictor_for(self._model)
+            return self._loaded_version, self._predictor, self._scaler
+
+    def load_async(self):
+        """Load (or refresh) the model on the worker pool without blocking the UI."""
+        return get_task_runner().submit(
+            lambda progress: self.get(),
+            on_result=self.model_loaded.emit,
+            on_error=self.load_failed.emit,
+        )
+
+    def next_version(self):
+        """Name for a new version folder, one past the highest existing number."""
+        numbers = [int(name[1:]) for name in os.listdir(self.versions_dir) if re.fullmatch(r'v\d+', name)]
+        return f"v{max(numbers, default=0) + 1:04d}"
+
+    def publish(self, version):
+        """Make a stored version the active model.
+
+        ``LATEST`` is replaced in one rename, which switches model and scaler
+        together, and the model is reloaded in the background.
+        """
+        with open(f"{self.latest_file}.tmp", 'w') as f:
+            f.write(version)
+        os.replace(f"{self.latest_file}.tmp", self.latest_file)
+        self._watch(self.latest_file)
+        return self.load_async()
+
+    def retrain_async(self, daily, source=None, on_progress=None, on_result=None, on_error=None):
+        """Retrain on ``daily`` totals (see ``logic.forecast.daily_totals``) without blocking the UI.
+
+        Training runs in a worker process with the resident forest's
+        hyperparameters. The new version is published once written, and
+        ``on_result`` receives its metadata.
+        """
+        from logic.training import forest_params, retrain
+        version = self.next_version()
+
+        def train(progress):
+            params = forest_params(self.get())
+            progress(0, 1, f"Training {version} on {len(daily):,} daily totals...")
+            return retrain(daily, os.path.join(self.versions_dir, version), params, source)
+
+        def done(metadata):
+            self.publish(version)
+            if on_result is not None:
+                on_result({'version': version, **metadata})
+
+        return get_task_runner().submit(train, on_result=done, on_error=on_error, on_progress=on_progress)
+
+    def export_joblib(self, path=None):
+        """Write the resident model as a .joblib file that later loads memory-mapped."""
+        import joblib
+        path = path or os.path.splitext(self.model_path)[0] + '.joblib'
+        joblib.dump(self.get(), path)
+        return path
+
+    def _on_file_changed(self, path):
+        # Editors and atomic writers replace the file, which drops it from the watcher
+        self._watch(path)
+        self.load_async()
+
+
+_registry = None
+
+
+def get_model_registry():
+    """Return the application-wide model registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
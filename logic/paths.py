@@ -0,0 +1,13 @@
+import os
+
+# Per-user directory for caches and other state that must survive restarts
+APP_DATA_DIR = os.environ.get(
+    "FINANCE_DASHBOARD_HOME", os.path.join(os.path.expanduser("~"), ".finance_dashboard")
+)
+
+
+def app_data_path(*parts):
+    """Return a path under the application data directory, creating its parent."""
+    path = os.path.join(APP_DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Spans kept in memory; older ones are dropped first
+MAX_SPANS = 10_000
+
+
+def peak_rss_bytes():
+    """High-water mark of this process's resident memory, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Tracer:
+    """Records timed spans (stage name, duration, row count, peak memory) from any thread.
+
+    Spans are plain dicts kept in a bounded deque, cheap enough to leave on
+    in normal use. Memory is the process's peak resident set size when the
+    span ended, plus how much that peak grew during the span. ``export_chrome_trace``
+    writes them in the Chrome trace event format (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.origin = time.perf_counter()
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        # Bumped on every record/clear so views can tell cheaply whether to refresh
+        self.version = 0
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name, category='app', rows=None):
+        """Time the enclosed block; the yielded dict can be updated, e.g. ``span['rows'] = n``."""
+        record = {'name': name, 'category': category, 'rows': rows}
+        if not self.enabled:
+            yield record
+            return
+        peak_before = peak_rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            ended = time.perf_counter()
+            peak_after = peak_rss_bytes()
+            record.update(
+                start=started - self.origin,
+                duration=ended - started,
+                thread=threading.current_thread().name,
+                tid=threading.get_native_id(),
+                peak_rss=peak_after,
+                peak_growth=peak_after - peak_before if peak_after is not None else None,
+            )
+            with self._lock:
+                self._spans.append(record)
+                self.version += 1
+
+    def spans(self):
+        """Snapshot of the recorded spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self.version += 1
+
+    def summary(self):
+        """Per-stage totals, slowest total first: name, category, count, total, max, rows."""
+        stages = {}
+        for span in self.spans():
+            stage = stages.setdefault(span['name'], {
+                'name': span['name'], 'category': span['category'],
+                'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0,
+            })
+            stage['count'] += 1
+            stage['total'] += span['duration']
+            stage['max'] = max(stage['max'], span['duration'])
+            stage['rows'] += span['rows'] or 0
+        return sorted(stages.values(), key=lambda stage: stage['total'], reverse=True)
+
+    def chrome_trace(self):
+        """The spans as a Chrome trace event document (times in microseconds)."""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for span in self.spans():
+            threads[span['tid']] = span['thread']
+            args = {'rows': span['rows']}
+            if span['peak_rss'] is not None:
+                args['peak_rss_mb'] = round(span['peak_rss'] / 2**20, 1)
+                args['peak_growth_mb'] = round(span['peak_growth'] / 2**20, 1)
+            events.append({
+                'name': span['name'], 'cat': span['category'], 'ph': 'X',
+                'ts': span['start'] * 1e6, 'dur': span['duration'] * 1e6,
+                'pid': pid, 'tid': span['tid'], 'args': args,
+            })
+        # Metadata events so the viewer shows thread names instead of ids
+        for tid, name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+_tracer = None
+
+
+def get_tracer():
+    """Return the process-wide tracer, creating it on first use."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def span(name, category='app', rows=None):
+    """Shorthand for ``get_tracer().span(...)``."""
+    return get_tracer().span(name, category, rows)
@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from logic.features import build_features, fit_scaler, get_feature_cache, read_scaler, scaler_columns
+from logic.perf import span
+
+DEFAULT_MODEL_PATH = 'prediction_expense_model/best_random_forest_(tuned)_model.pkl'
+
+# Feature columns, in the order the bundled model was trained on; a retrained
+# model's columns are those of its scaler (see features.scaler_columns)
+FEATURES = ['lag_1', 'lag_7', 'day_of_week', 'month']
+
+# Scaler files saved beside a model: a retrained version's, and the bundled model's
+VERSION_SCALER = 'scaler.pkl'
+BUNDLED_SCALER = 'feature_scaler.pkl'
+
+# Rows scored per model.predict call; results are streamed to the UI per chunk
+PREDICTION_CHUNK_SIZE = 50_000
+
+# Inputs at least this large are scored across a process pool
+PROCESS_POOL_MIN_ROWS = 200_000
+
+# Model held by each process-pool worker, loaded once by _init_worker
+_worker_model = None
+
+
+def load_model_file(path):
+    """Load a model from disk; ``.joblib`` files are memory-mapped read-only."""
+    with span('load model', 'model'):
+        if path.endswith('.joblib'):
+            import joblib
+            # Large numpy arrays (the forest's node tables) stay on disk and are paged in lazily
+            return joblib.load(path, mmap_mode='r')
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def model_scaler(model_path):
+    """The scaler saved beside the model file at ``model_path``, or None if there is none."""
+    folder = os.path.dirname(model_path)
+    for name in (VERSION_SCALER, BUNDLED_SCALER):
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            return read_scaler(path)
+    return None
+
+
+def _init_worker(model_path):
+    """Process-pool initializer: load the model once per worker process."""
+    global _worker_model
+    _worker_model = load_model_file(model_path)
+
+
+def _predict_chunk(X):
+    return _worker_model.predict(X)
+
+
+def predict_chunks(model, X, chunk_size=PREDICTION_CHUNK_SIZE, workers=1, model_path=None):
+    """Yield ``(start, predictions)`` for consecutive chunks of X, in order.
+
+    With ``workers > 1`` the chunks are scored across a process pool whose
+    workers load the model from ``model_path`` themselves, so the model is
+    never pickled per chunk.
+    """
+    starts = range(0, len(X), chunk_size)
+    if workers <= 1 or model_path is None:
+        for start in starts:
+            yield start, model.predict(X[start:start + chunk_size])
+        return
+
+    # Spawned, not forked: this runs on a worker thread of a multithreaded Qt process
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,),
+                                   mp_context=multiprocessing.get_context('spawn'))
+    try:
+        results = executor.map(_predict_chunk, (X[start:start + chunk_size] for start in starts))
+        for start, predictions in zip(starts, results):
+            yield start, predictions
+    finally:
+        # On cancellation, drop the chunks that have not started yet
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def prepare_features(data, scaler=None, version=None, progress=None):
+    """Feature frame and input for ``data`` scaled by the model's ``scaler``.
+
+    The input has the columns ``scaler`` was fitted on; without a scaler,
+    the bundled model's ``FEATURES``.
+
+    With a ``version`` identifying the data and model (the store's and the
+    registry's versions), the result is cached, so predicting again on
+    unchanged data skips feature engineering and scaling.
+    """
+    if version is not None:
+        cached = get_feature_cache().get(version)
+        if cached is not None:
+            return cached
+
+    with span('build features', 'predict', rows=len(data)):
+        features = build_features(data)
+    if progress is not None:
+        progress(0, len(features), "Scaling features...")
+
+    # Feature scaling with the scaler the model was trained behind
+    with span('scale features', 'predict', rows=len(features)):
+        if scaler is None:
+            scaler = fit_scaler(features, FEATURES)
+        X = scaler.transform(features[scaler_columns(scaler)])
+
+    if version is not None:
+        get_feature_cache().put(version, (features, X))
+    return features, X
+
+
+def run_prediction(data, model, model_path=None, chunk_size=PREDICTION_CHUNK_SIZE,
+                   workers=None, progress=None, partial=None, version=None, scaler=None):
+    """Score ``data`` chunk by chunk, streaming each chunk through ``partial``.
+
+    Each partial is a dict of Date/Amount/Predicted arrays. ``scaler`` is
+    the one ``model`` was trained with (without one, a scaler is fitted on
+    ``data`` alone and discarded); pass a ``version`` identifying data and
+    model to reuse cached features. Returns the number of rows scored
+    and the total predicted amount.
+    """
+    features, X = prepare_features(data, scaler, version, progress)
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 4) if len(X) >= PROCESS_POOL_MIN_ROWS else 1
+
+    dates = features['Date'].to_numpy()
+    amounts = features['Amount'].to_numpy()
+    total = 0.0
+    with span('predict', 'predict', rows=len(X)):
+        for start, predictions in predict_chunks(model, X, chunk_size, workers, model_path):
+            end = start + len(predictions)
+            total += float(np.sum(predictions))
+            if partial is not None:
+                partial({'Date': dates[start:end], 'Amount': amounts[start:end], 'Predicted': predictions})
+            if progress is not None:
+                progress(end, len(X), f"Predicted {end:,} of {len(X):,} rows...")
+    return {'rows': len(X), 'total': total}
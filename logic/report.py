@@ -0,0 +1,164 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+# Headless: render with Agg so no display (or Qt) is needed
+matplotlib.use('Agg')
+from matplotlib.backends.backend_pdf import PdfPages
+import numpy as np
+import pandas as pd
+from logic.figures import (
+    ChartFigure, PERIOD_TITLES, plot_category_bars, plot_category_donut, plot_daily_line,
+    plot_period_comparison, plot_predictions,
+)
+from logic.file_import import expand_paths, read_transactions
+from logic.prediction import DEFAULT_MODEL_PATH, load_model_file, model_scaler, run_prediction
+from logic.rollup import RollupCube
+
+# Output formats written for every input file
+FORMATS = ('png', 'pdf', 'csv')
+
+
+def kpi_table(rollup):
+    """The dashboard's KPI cards as a one-row frame."""
+    return pd.DataFrame([{
+        'Total Expenses': rollup.total,
+        'Total Categories': rollup.category_count(),
+        'Top Category': rollup.top_category(),
+    }])
+
+
+def render_charts(rollup, predictions=None):
+    """Draw the dashboard and report charts; returns ``(name, ChartFigure)`` pairs."""
+    charts = []
+
+    def new_chart(name):
+        chart = ChartFigure(width=8, height=5)
+        charts.append((name, chart))
+        return chart
+
+    plot_category_bars(new_chart('category_bar'), rollup)
+    plot_category_donut(new_chart('category_donut'), rollup)
+    plot_daily_line(new_chart('daily_line'), rollup)
+    for period, suffix in (('M', 'monthly'), ('Y', 'yearly')):
+        plot_period_comparison(new_chart(f'{suffix}_line'), new_chart(f'{suffix}_bar'),
+                               rollup.period_table(period), 'Date', 'Amount', PERIOD_TITLES[period])
+    if predictions is not None:
+        plot_predictions(new_chart('predictions'), predictions['Date'].to_numpy(),
+                         predictions['Predicted'].to_numpy())
+    for _, chart in charts:
+        chart.fig.tight_layout()
+    return charts
+
+
+def predict(data, model_path):
+    """Score the data with the model at ``model_path`` and its saved scaler; returns a Date/Amount/Predicted frame."""
+    model = load_model_file(model_path)
+    chunks = []
+    # Already inside a pool worker, so score in this process
+    run_prediction(data, model, workers=1, partial=chunks.append, scaler=model_scaler(model_path))
+    return pd.DataFrame({column: np.concatenate([chunk[column] for chunk in chunks])
+                         for column in ('Date', 'Amount', 'Predicted')})
+
+
+def build_report(file_path, out_dir, formats=FORMATS, model_path=None):
+    """Write the report for one input file into its own folder under ``out_dir``.
+
+    Runs the same rollup and chart code as the dashboard and reports views;
+    with ``model_path`` set, the expense predictions are added as well.
+    Returns the list of files written.
+    """
+    data = read_transactions(file_path)
+    rollup = RollupCube.from_frame(data)
+    if rollup.is_empty():
+        raise ValueError(f"No Date/Category/Amount rows in {file_path}")
+    predictions = predict(data, model_path) if model_path else None
+
+    # Keep the extension in the folder name so a.csv and a.xlsx do not collide
+    report_dir = os.path.join(out_dir, os.path.basename(file_path).replace('.', '_'))
+    os.makedirs(report_dir, exist_ok=True)
+    written = []
+
+    if 'csv' in formats:
+        tables = {
+            'kpis': kpi_table(rollup),
+            'by_category': rollup.category_totals().rename('Amount').rename_axis('Category').reset_index(),
+            'monthly': rollup.period_table('M'),
+            'yearly': rollup.period_table('Y'),
+        }
+        if predictions is not None:
+            tables['predictions'] = predictions
+        for name, table in tables.items():
+            path = os.path.join(report_dir, f'{name}.csv')
+            table.to_csv(path, index=False)
+            written.append(path)
+
+    if 'png' in formats or 'pdf' in formats:
+        charts = render_charts(rollup, predictions)
+        if 'png' in formats:
+            for name, chart in charts:
+                path = os.path.join(report_dir, f'{name}.png')
+                chart.fig.savefig(path)
+                written.append(path)
+        if 'pdf' in formats:
+            # One multi-page PDF with every chart
+            path = os.path.join(report_dir, 'report.pdf')
+            with PdfPages(path) as pdf:
+                for _, chart in charts:
+                    pdf.savefig(chart.fig)
+            written.append(path)
+    return written
+
+
+def run_reports(files, out_dir, formats=FORMATS, model_path=None, workers=None):
+    """Build reports for many files across a process pool; returns the number of failures."""
+    workers = workers or min(os.cpu_count() or 1, len(files))
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        started = {}
+        futures = {}
+        for file_path in files:
+            future = executor.submit(build_report, file_path, out_dir, formats, model_path)
+            futures[future] = file_path
+            started[future] = time.perf_counter()
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                written = future.result()
+                print(f"{file_path}: {len(written)} files in {time.perf_counter() - started[future]:.1f} s")
+            except Exception as e:
+                failures += 1
+                print(f"Error building report for {file_path}: {e}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m logic.report',
+        description="Render the dashboard, reports and predictions for expense files without a display.",
+    )
+    parser.add_argument('inputs', nargs='+', help="CSV/Excel files, or directories containing them")
+    parser.add_argument('-o', '--output', default='reports', help="output directory (default: reports)")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS),
+                        help="outputs to write (default: all)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes to use (default: one per CPU, up to the number of files)")
+    parser.add_argument('--predict', action='store_true', help="add expense predictions to each report")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="model used with --predict")
+    args = parser.parse_args(argv)
+
+    files = expand_paths(args.inputs)
+    if not files:
+        print("No input files found.")
+        return 1
+    os.makedirs(args.output, exist_ok=True)
+    model_path = os.path.abspath(args.model) if args.predict else None
+    failures = run_reports(files, args.output, args.formats, model_path, args.workers)
+    print(f"Wrote reports for {len(files) - failures} of {len(files)} files to {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import numpy as np
+import pandas as pd
+from logic.dtypes import amount_values
+from logic.lru import LRUCache
+from logic.perf import span
+
+# Time granularities kept in the cube: day, month and year
+FREQUENCIES = ('D', 'M', 'Y')
+
+# Report period tables kept for recent (dataset version, granularity) keys
+PERIOD_TABLE_CACHE_SIZE = 8
+
+
+class RollupCube:
+    """Sum and count of Amount per time bucket x Category, built once per load.
+
+    Only the daily level is computed from raw rows; months and years roll up
+    from it. KPIs and charts read from the cube, so switching views or periods
+    costs O(buckets) instead of another pass over every transaction.
+    """
+
+    def __init__(self, levels=None, total=0.0, rows=0):
+        # {freq: DataFrame with 'sum'/'count' columns indexed by (Date, Category)}
+        self.levels = levels or {}
+        self.total = total
+        self.rows = rows
+        self._period_totals = {}
+        self._daily_totals = None
+        if self.levels:
+            self._category_totals = self.levels['Y']['sum'].groupby(level='Category').sum()
+        else:
+            self._category_totals = pd.Series(dtype='float64')
+
+    @classmethod
+    def from_frame(cls, data):
+        """Build the cube from a transaction frame with Date, Category and Amount."""
+        if data.empty or 'Date' not in data.columns or 'Amount' not in data.columns:
+            return cls()
+
+        with span('aggregate', 'aggregate', rows=len(data)):
+            days = data['Date'].dt.normalize()
+            if 'Category' in data.columns:
+                categories = data['Category']
+            else:
+                categories = pd.Series('Uncategorized', index=data.index)
+
+            # Summed as float64 dollars whether Amount is held as float32 or cents
+            amounts = pd.Series(amount_values(data), index=data.index)
+            daily = amounts.groupby([days, categories], observed=True, sort=True).agg(['sum', 'count'])
+            daily.index.names = ['Date', 'Category']
+            levels = {'D': daily}
+
+            # Coarser levels are aggregated from the daily buckets, not the raw rows
+            day_index = daily.index.get_level_values('Date')
+            category_index = daily.index.get_level_values('Category')
+            for freq in ('M', 'Y'):
+                level = daily.groupby([day_index.to_period(freq), category_index], observed=True, sort=True).sum()
+                level.index.names = ['Date', 'Category']
+                levels[freq] = level
+
+            return cls(levels, total=float(amounts.sum()), rows=len(data))
+
+    def apply(self, delta, delta_cube=None):
+        """Fold newly appended rows into the running totals in place.
+
+        Only the buckets touched by ``delta`` are updated, so the cost is
+        O(delta) rather than a rescan of the whole history. Pass a prebuilt
+        ``delta_cube`` to skip aggregating the delta here.
+        """
+        if delta_cube is None:
+            delta_cube = RollupCube.from_frame(delta)
+        if delta_cube.is_empty():
+            return
+        if self.is_empty():
+            self.levels = delta_cube.levels
+            self.total = delta_cube.total
+            self.rows = delta_cube.rows
+            self._category_totals = delta_cube._category_totals
+            self._period_totals = {}
+            self._daily_totals = None
+            return
+
+        with span('aggregate append', 'aggregate', rows=delta_cube.rows):
+            for freq in FREQUENCIES:
+                self.levels[freq] = _accumulate(self.levels[freq], delta_cube.levels[freq])
+            self.total += delta_cube.total
+            self.rows += delta_cube.rows
+            self._daily_totals = None
+            self._category_totals = _accumulate(self._category_totals, delta_cube.category_totals())
+            for freq, totals in self._period_totals.items():
+                totals = _accumulate(totals, delta_cube.period_totals(freq))
+                if freq == 'D':
+                    # New days may leave a gap; fill it with zero-spend days
+                    totals = totals.asfreq('D', fill_value=0)
+                self._period_totals[freq] = totals
+
+    def is_empty(self):
+        return not self.levels
+
+    def category_totals(self):
+        """Total Amount per category."""
+        return self._category_totals
+
+    def category_count(self):
+        """Number of distinct categories with at least one transaction."""
+        return len(self._category_totals)
+
+    def top_category(self):
+        """Category with the largest total, or None when the cube is empty."""
+        if self._category_totals.empty:
+            return None
+        return self._category_totals.idxmax()
+
+    def period_totals(self, freq):
+        """Total Amount per day, month or year across all categories.
+
+        The daily series includes zero-spend days, like ``resample('D')``.
+        """
+        if freq not in self._period_totals:
+            if self.is_empty():
+                totals = pd.Series(dtype='float64')
+            else:
+                totals = self.levels[freq]['sum'].groupby(level='Date').sum()
+                if freq == 'D':
+                    totals = totals.asfreq('D', fill_value=0)
+            self._period_totals[freq] = totals
+        return self._period_totals[freq]
+
+    def period_table(self, freq):
+        """Period totals as a Date/Amount frame with string dates, ready for charting."""
+        df = self.period_totals(freq).rename('Amount').rename_axis('Date').reset_index()
+        df['Date'] = df['Date'].astype(str)  # Convert to string for chart
+        return df
+
+    def daily_totals(self):
+        """The daily level as a ``DailyTotals`` matrix for date-range and category slicing (cached)."""
+        if self._daily_totals is None:
+            self._daily_totals = DailyTotals(self.levels['D'] if self.levels else None)
+        return self._daily_totals
+
+
+class DailyTotals:
+    """Dense day x category matrices of the daily sums and counts.
+
+    ``days`` is a sorted, immutable DatetimeIndex covering every day from
+    the first to the last transaction, so a date range is located with two
+    ``searchsorted`` calls. Cumulative sums along the days give any range's
+    per-category totals in O(categories), however many transactions the
+    range holds. The arrays are read-only and shared by every slice.
+    """
+
+    def __init__(self, daily=None):
+        if daily is None or daily.empty:
+            self.days = pd.DatetimeIndex([])
+            self.categories = pd.Index([])
+            sums = counts = np.zeros((0, 0))
+        else:
+            sums = daily['sum'].unstack('Category', fill_value=0).asfreq('D', fill_value=0)
+            counts = daily['count'].unstack('Category', fill_value=0).reindex(sums.index, fill_value=0)
+            self.days = sums.index
+            self.categories = sums.columns
+            sums, counts = sums.to_numpy(dtype='float64'), counts.to_numpy(dtype='int64')
+        self.sums = sums
+        # Row i holds the totals of days [0, i)
+        self.cumulative_sums = np.vstack([np.zeros((1, sums.shape[1])), np.cumsum(sums, axis=0)])
+        self.cumulative_counts = np.vstack([np.zeros((1, counts.shape[1]), dtype='int64'),
+                                            np.cumsum(counts, axis=0)])
+        for array in (self.sums, self.cumulative_sums, self.cumulative_counts):
+            array.flags.writeable = False
+
+    def bounds(self, start=None, end=None):
+        """Row range ``[first, last)`` of the days from ``start`` to ``end``, both inclusive."""
+        first = 0 if start is None else int(self.days.searchsorted(pd.Timestamp(start), side='left'))
+        last = len(self.days) if end is None else int(self.days.searchsorted(pd.Timestamp(end), side='right'))
+        return first, max(first, last)
+
+    def select(self, start=None, end=None, categories=None):
+        """Totals for days in [start, end] and the given categories (all by default)."""
+        first, last = self.bounds(start, end)
+        if categories is None:
+            columns = np.arange(len(self.categories))
+        else:
+            columns = self.categories.get_indexer(list(categories))
+            columns = columns[columns >= 0]
+        return RollupSlice(self, first, last, columns)
+
+
+class RollupSlice:
+    """A date range and category subset of a ``DailyTotals``.
+
+    Offers the parts of the ``RollupCube`` interface the dashboard and its
+    charts use, computed from views of the shared matrices without copying them.
+    """
+
+    def __init__(self, totals, first, last, columns):
+        self.categories = totals.categories[columns]
+        self.days = totals.days[first:last]
+        self._sums = totals.sums[first:last, columns]
+        self._category_totals = pd.Series(
+            totals.cumulative_sums[last, columns] - totals.cumulative_sums[first, columns],
+            index=self.categories, dtype='float64')
+        counts = totals.cumulative_counts[last, columns] - totals.cumulative_counts[first, columns]
+        # Like the cube, only categories with a transaction in range count
+        self._category_totals = self._category_totals[counts > 0]
+        self.rows = int(counts.sum())
+        self.total = float(self._category_totals.sum())
+
+    def is_empty(self):
+        return self.rows == 0
+
+    def category_totals(self):
+        """Total Amount per category with transactions in the range."""
+        return self._category_totals
+
+    def category_count(self):
+        return len(self._category_totals)
+
+    def top_category(self):
+        if self._category_totals.empty:
+            return None
+        return self._category_totals.idxmax()
+
+    def period_totals(self, freq):
+        """Daily totals across the selected categories; only the daily level is sliced."""
+        if freq != 'D':
+            raise ValueError("Only daily totals are available for a date range")
+        return pd.Series(self._sums.sum(axis=1), index=self.days)
+
+
+def _accumulate(table, delta):
+    """Add ``delta`` into ``table`` bucket by bucket, touching only delta's rows.
+
+    Works for Series and DataFrames sharing an index. Buckets missing from
+    ``table`` are appended and the index re-sorted.
+    """
+    positions = table.index.get_indexer(delta.index)
+    found = positions >= 0
+    if found.any():
+        if isinstance(table, pd.Series):
+            table.iloc[positions[found]] = table.iloc[positions[found]].to_numpy() + delta.to_numpy()[found]
+        else:
+            for j in range(table.shape[1]):
+                table.iloc[positions[found], j] = (
+                    table.iloc[positions[found], j].to_numpy() + delta.iloc[:, j].to_numpy()[found]
+                )
+    if not found.all():
+        table = pd.concat([table, delta[~found]]).sort_index()
+    return table
+
+
+_period_table_cache = None
+
+
+def get_period_table_cache():
+    """Return the application-wide cache of report period tables keyed by (dataset version, granularity)."""
+    global _period_table_cache
+    if _period_table_cache is None:
+        _period_table_cache = LRUCache(PERIOD_TABLE_CACHE_SIZE)
+    return _period_table_cache
+
+
+def cached_period_table(rollup, freq, version):
+    """``rollup.period_table(freq)``, memoized per ``(version, freq)``.
+
+    ``version`` must change whenever the cube does (the store bumps it on
+    every load and append), so a cached table is never stale.
+    """
+    key = (version, freq)
+    table = get_period_table_cache().get(key)
+    if table is None:
+        table = rollup.period_table(freq)
+        get_period_table_cache().put(key, table)
+    return table
@@ -0,0 +1,85 @@
+import importlib
+import os
+import sys
+import time
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+from logic.perf import span
+
+# Set to print the startup timings once the window has painted
+PROFILE_ENV_VAR = "FINANCE_DASHBOARD_PROFILE_STARTUP"
+
+
+class StartupTimer(QObject):
+    """Records import times, view construction times and time to first paint.
+
+    Times are measured from ``start`` (normally taken as the first statement
+    of app.py) so regressions in startup can be tracked between runs.
+    """
+
+    # Emitted (from the event loop, after the paint completes) once the watched widget first paints
+    first_painted = Signal()
+
+    def __init__(self, start=None):
+        super().__init__()
+        self.start = start if start is not None else time.perf_counter()
+        # (label, seconds) in the order they were recorded
+        self.records = []
+        self.first_paint = None
+
+    def record(self, label, seconds):
+        self.records.append((label, seconds))
+        # Views built lazily after the first paint are reported as they happen
+        if self.first_paint is not None and os.environ.get(PROFILE_ENV_VAR):
+            print(f"  {label:<45} {seconds * 1000:8.1f} ms")
+
+    def timed_import(self, module_name):
+        """Import a module, recording how long it took if it was not loaded yet."""
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        started = time.perf_counter()
+        with span(f"import {module_name}", 'startup'):
+            module = importlib.import_module(module_name)
+        self.record(f"import {module_name}", time.perf_counter() - started)
+        return module
+
+    def timed_construct(self, label, factory):
+        """Call ``factory()`` and record how long it took."""
+        started = time.perf_counter()
+        with span(f"construct {label}", 'startup'):
+            result = factory()
+        self.record(f"construct {label}", time.perf_counter() - started)
+        return result
+
+    def watch_first_paint(self, widget):
+        """Record the time of the first paint event of ``widget``."""
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if self.first_paint is None and event.type() == QEvent.Paint:
+            self.first_paint = time.perf_counter() - self.start
+            watched.removeEventFilter(self)
+            if os.environ.get(PROFILE_ENV_VAR):
+                print(self.report())
+            # Defer so listeners never build widgets in the middle of a paint
+            QTimer.singleShot(0, self.first_painted.emit)
+        return False
+
+    def report(self):
+        """Human-readable summary of everything recorded so far."""
+        lines = ["Startup timings:"]
+        for label, seconds in self.records:
+            lines.append(f"  {label:<45} {seconds * 1000:8.1f} ms")
+        if self.first_paint is not None:
+            lines.append(f"  {'time to first paint':<45} {self.first_paint * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+_timer = None
+
+
+def get_startup_timer(start=None):
+    """Return the application-wide startup timer, creating it on first use."""
+    global _timer
+    if _timer is None:
+        _timer = StartupTimer(start)
+    return _timer
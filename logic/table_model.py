@@ -0,0 +1,209 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+import numpy as np
+import pandas as pd
+from logic.dtypes import amount_values
+
+
+def format_value(value):
+    """Render a single numpy scalar for display in a table cell."""
+    if value is None or value is pd.NA:
+        return ""
+    if isinstance(value, (float, np.floating)):
+        return "" if np.isnan(value) else f"{value:,.2f}"
+    if isinstance(value, np.datetime64):
+        return "" if np.isnat(value) else str(pd.Timestamp(value).date())
+    return str(value)
+
+
+class ChunkedTableModel(QAbstractTableModel):
+    """Table model that grows by whole chunks of column arrays.
+
+    Rows are appended chunk by chunk as results stream in; the view only asks
+    for the cells it shows, so no per-cell Python objects are created up front.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        # One dict of column -> numpy array per appended chunk
+        self._chunks = []
+        # Row offset at which each chunk starts, plus the total row count
+        self._offsets = [0]
+
+    def clear(self):
+        self.beginResetModel()
+        self._chunks = []
+        self._offsets = [0]
+        self.endResetModel()
+
+    def append_chunk(self, chunk):
+        """Append a DataFrame (or dict of arrays) holding at least ``columns``."""
+        arrays = {column: np.asarray(chunk[column]) for column in self.columns}
+        count = len(arrays[self.columns[0]]) if self.columns else 0
+        if count == 0:
+            return
+        first = self._offsets[-1]
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self._chunks.append(arrays)
+        self._offsets.append(first + count)
+        self.endInsertRows()
+
+    def column_values(self, column):
+        """All values of a column as one array (concatenated on demand)."""
+        if not self._chunks:
+            return np.array([])
+        return np.concatenate([chunk[column] for chunk in self._chunks])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._offsets[-1]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = index.row()
+        # Locate the chunk holding this row by binary search over the offsets
+        chunk_index = int(np.searchsorted(self._offsets, row, side='right')) - 1
+        chunk = self._chunks[chunk_index]
+        return format_value(chunk[self.columns[index.column()]][row - self._offsets[chunk_index]])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Table model backed directly by a DataFrame's column arrays.
+
+    Categorical columns are kept as integer codes plus their categories, so no
+    per-cell Python objects are created. Rows are exposed in batches through
+    ``canFetchMore``/``fetchMore`` as the view scrolls, and sorting and
+    filtering only compute a new row permutation with vectorized numpy/pandas
+    operations; the underlying arrays are never copied or reordered.
+    """
+
+    # Rows made visible per fetchMore call
+    FETCH_BATCH = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self._arrays = []
+        self._categories = []
+        # Row permutation currently shown (after filtering and sorting)
+        self._order = np.arange(0)
+        self._loaded = 0
+        self._sort = None
+
+    def set_frame(self, data):
+        """Show a new DataFrame; only references to its column arrays are kept."""
+        self.beginResetModel()
+        self.columns = [str(column) for column in data.columns]
+        self._arrays = []
+        self._categories = []
+        for column in data.columns:
+            series = data[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                self._arrays.append(series.cat.codes.to_numpy())
+                self._categories.append(series.cat.categories.to_numpy())
+            elif column == 'Amount' and pd.api.types.is_integer_dtype(series.dtype):
+                # Amounts held as cents are shown in dollars
+                self._arrays.append(amount_values(data))
+                self._categories.append(None)
+            else:
+                self._arrays.append(series.to_numpy())
+                self._categories.append(None)
+        self._order = np.arange(len(data))
+        self._loaded = min(self.FETCH_BATCH, len(self._order))
+        self._sort = None
+        self.endResetModel()
+
+    def _sort_keys(self, column, rows):
+        """Integer or numeric sort keys for ``column`` at ``rows``."""
+        values = self._arrays[column][rows]
+        categories = self._categories[column]
+        if categories is not None:
+            # Rank categories by label so codes sort alphabetically; missing (-1) first
+            ranks = np.empty(len(categories) + 1, dtype=np.int64)
+            ranks[0] = -1
+            ranks[1:] = pd.Index(categories).argsort().argsort()
+            return ranks[values + 1]
+        if values.dtype.kind == 'O':
+            codes, _ = pd.factorize(values, sort=True)
+            return codes
+        return values
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder rows by ``column`` through an argsort of the current permutation."""
+        if column < 0 or column >= len(self.columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        permutation = np.argsort(self._sort_keys(column, self._order), kind='stable')
+        if order == Qt.DescendingOrder:
+            permutation = permutation[::-1]
+        self._order = self._order[permutation]
+        self._sort = (column, order)
+        self.layoutChanged.emit()
+
+    def set_filter(self, column, text):
+        """Keep rows whose ``column`` contains ``text`` (case-insensitive); empty text clears."""
+        self.beginResetModel()
+        rows = np.arange(len(self._arrays[0])) if self._arrays else np.arange(0)
+        if text and 0 <= column < len(self.columns):
+            categories = self._categories[column]
+            if categories is not None:
+                # Match against the few category labels, then select rows by code
+                matching = pd.Series(categories).astype(str).str.contains(text, case=False, regex=False)
+                mask = np.isin(self._arrays[column], np.flatnonzero(matching.to_numpy()))
+            else:
+                mask = pd.Series(self._arrays[column]).astype(str).str.contains(
+                    text, case=False, regex=False, na=False).to_numpy()
+            rows = np.flatnonzero(mask)
+        self._order = rows
+        self._loaded = min(self.FETCH_BATCH, len(rows))
+        self.endResetModel()
+        if self._sort is not None:
+            self.sort(*self._sort)
+
+    def total_rows(self):
+        """Rows matching the current filter, including those not fetched yet."""
+        return len(self._order)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._order)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_BATCH, len(self._order) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        column = index.column()
+        value = self._arrays[column][self._order[index.row()]]
+        categories = self._categories[column]
+        if categories is not None:
+            return "" if value < 0 else str(categories[value])
+        return format_value(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(self._order[section] + 1)
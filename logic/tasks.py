@@ -0,0 +1,128 @@
+import threading
+import traceback
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class TaskCancelled(BaseException):
+    """Raised inside a task's progress callback once the task has been cancelled.
+
+    Like asyncio.CancelledError this is a BaseException, so the broad
+    ``except Exception`` handlers in the import and prediction code let it through.
+    """
+
+
+class TaskSignals(QObject):
+    """Signals a Task emits from its worker thread; Qt delivers them on the UI thread."""
+    # Percent complete (0-100) and a short status message
+    progress = Signal(int, str)
+    # Intermediate results (e.g. a chunk of predictions) streamed while running
+    partial = Signal(object)
+    # Return value of the task function
+    result = Signal(object)
+    # Error message if the task raised
+    error = Signal(str)
+    # Emitted when the task was cancelled before finishing
+    cancelled = Signal()
+    # Always emitted last, whatever the outcome
+    finished = Signal()
+
+
+class Task(QRunnable):
+    """Run ``fn(*args, progress=..., **kwargs)`` on the thread pool.
+
+    ``progress(done, total, message)`` reports progress back to the UI and
+    raises TaskCancelled once ``cancel()`` has been called, so long-running
+    functions stop at their next progress report.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self._cancel_event = threading.Event()
+        # TaskRunner owns the Python object; letting Qt delete it as well double-frees
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def report_progress(self, done, total, message=""):
+        """Progress callback handed to the task function."""
+        if self.is_cancelled():
+            raise TaskCancelled()
+        percent = int(done * 100 / total) if total else 0
+        self.signals.progress.emit(max(0, min(100, percent)), message)
+
+    def run(self):
+        try:
+            if self.is_cancelled():
+                raise TaskCancelled()
+            result = self.fn(*self.args, progress=self.report_progress, **self.kwargs)
+            if self.is_cancelled():
+                raise TaskCancelled()
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskRunner(QObject):
+    """Submits heavy work (parsing, aggregation, prediction) to a QThreadPool."""
+
+    def __init__(self, pool=None):
+        super().__init__()
+        self.pool = pool or QThreadPool.globalInstance()
+        # Keep Python references alive until each task has finished
+        self._active = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               on_partial=None, on_cancelled=None, on_finished=None, **kwargs):
+        """Run ``fn`` in the background and route its outcome to the given callbacks.
+
+        With ``on_partial``, ``fn`` also receives a ``partial`` callback whose
+        arguments are delivered to ``on_partial`` on the UI thread as they arrive.
+        """
+        task = Task(fn, *args, **kwargs)
+        if on_partial is not None:
+            task.kwargs['partial'] = task.signals.partial.emit
+            task.signals.partial.connect(on_partial)
+        if on_result is not None:
+            task.signals.result.connect(on_result)
+        if on_error is not None:
+            task.signals.error.connect(on_error)
+        if on_progress is not None:
+            task.signals.progress.connect(on_progress)
+        if on_cancelled is not None:
+            task.signals.cancelled.connect(on_cancelled)
+        if on_finished is not None:
+            task.signals.finished.connect(on_finished)
+        task.signals.finished.connect(lambda: self._active.discard(task))
+
+        self._active.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self):
+        for task in list(self._active):
+            task.cancel()
+
+
+_runner = None
+
+
+def get_task_runner():
+    """Return the application-wide task runner, creating it on first use."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
@@ -0,0 +1,272 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+from logic.features import FEATURE_COLUMNS, LAGS, build_features, write_scaler
+from logic.prediction import BUNDLED_SCALER, DEFAULT_MODEL_PATH, FEATURES, VERSION_SCALER, load_model_file
+
+# Forest settings used when the resident model is not a random forest
+# (the tuned values of the bundled model)
+DEFAULT_FOREST_PARAMS = {'n_estimators': 200, 'max_depth': 10, 'min_samples_split': 10}
+
+# Columns retrained models use: the bundled model's FEATURES plus the rolling means
+TRAINING_FEATURES = list(FEATURE_COLUMNS)
+
+# Most recent share of the days held out to score the new model
+TEST_FRACTION = 0.2
+
+# Fewer training rows than this cannot give a meaningful model
+MIN_TRAINING_ROWS = 50
+
+# Smallest and largest value of each whole-number calendar feature
+CALENDAR_RANGES = {'day_of_week': (0, 6), 'month': (1, 12)}
+
+# Largest distance of a recovered calendar threshold from the half-unit grid, in half units
+CALENDAR_GRID_TOLERANCE = 1e-3
+
+# Relative error allowed when checking scaler recovery on known data: the calendar scaling
+# comes back exact, the lags are estimates (within about 7% over 20 synthetic histories)
+RECOVERY_RTOL = {'lag_1': 0.10, 'lag_7': 0.10, 'day_of_week': 1e-4, 'month': 1e-4}
+
+
+def forest_params(model):
+    """Hyperparameters for retraining: the resident forest's own, or the defaults."""
+    from sklearn.ensemble import RandomForestRegressor
+    if isinstance(model, RandomForestRegressor):
+        params = model.get_params()
+    else:
+        params = dict(DEFAULT_FOREST_PARAMS)
+    params.pop('n_jobs', None)
+    return params
+
+
+def dense_daily(daily):
+    """Per-category daily totals on a full calendar, zero on days without spending.
+
+    The cube only holds days that had transactions, so without this a
+    category's ``lag_1`` would be its previous day *with spending*. The
+    forecast (``logic.forecast.forecast_history``) and the notebook that
+    trained the bundled model both count empty days as zero. Each category
+    runs from its first day with spending to the last day of the data.
+    """
+    wide = daily.unstack('Category', fill_value=0).asfreq('D', fill_value=0)
+    # Days before a category's first spending are left out rather than zero
+    started = wide.ne(0).cummax()
+    dense = wide.where(started).stack().dropna()
+    return dense.rename_axis(['Date', 'Category']).rename(daily.name)
+
+
+def train_model(daily, output_dir, params=None, source=None):
+    """Fit a forest on per-category daily totals and write it to ``output_dir``.
+
+    Runs in a worker process. The model takes ``TRAINING_FEATURES``, which
+    its saved scaler records for prediction and forecasting. The newest ``TEST_FRACTION`` of the rows is
+    held out for the reported metrics. Training uses every core
+    (``n_jobs=-1``); the saved model predicts single-threaded, since its
+    batches are small. The folder holds ``model.joblib``, ``scaler.pkl`` and
+    ``metadata.json``; it is written under a temporary name and renamed into
+    place, so it is never seen half-written. Returns the metadata.
+
+    ``daily`` may omit days without spending (see ``dense_daily``).
+    """
+    import joblib
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    from sklearn.preprocessing import StandardScaler
+
+    started = time.perf_counter()
+    features = build_features(dense_daily(daily).rename('Amount').reset_index())
+    if len(features) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Need at least {MIN_TRAINING_ROWS} days of history to retrain, got {len(features)}.")
+
+    # Features come out in date order, so the split holds out the most recent days
+    split = int(len(features) * (1 - TEST_FRACTION))
+    X, y = features[TRAINING_FEATURES], features['Amount'].to_numpy()
+    scaler = StandardScaler().fit(X.iloc[:split])
+    X_scaled = scaler.transform(X)
+
+    model = RandomForestRegressor(**(params or DEFAULT_FOREST_PARAMS), n_jobs=-1)
+    model.fit(X_scaled[:split], y[:split])
+    model.set_params(n_jobs=None)
+    fit_seconds = time.perf_counter() - started
+
+    predicted = model.predict(X_scaled[split:])
+    metadata = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'source': source,
+        'training_rows': split,
+        'test_rows': len(features) - split,
+        'first_date': str(features['Date'].iloc[0].date()),
+        'last_date': str(features['Date'].iloc[-1].date()),
+        'features': list(TRAINING_FEATURES),
+        'params': model.get_params(),
+        'metrics': {
+            'rmse': float(np.sqrt(mean_squared_error(y[split:], predicted))),
+            'mae': float(mean_absolute_error(y[split:], predicted)),
+            'r2': float(r2_score(y[split:], predicted)),
+        },
+        'fit_seconds': fit_seconds,
+        'cpu_count': os.cpu_count(),
+    }
+
+    tmp_dir = f"{output_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        joblib.dump(model, os.path.join(tmp_dir, 'model.joblib'))
+        write_scaler(scaler, TRAINING_FEATURES, os.path.join(tmp_dir, VERSION_SCALER))
+        metadata['seconds'] = time.perf_counter() - started
+        with open(os.path.join(tmp_dir, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_dir, output_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return metadata
+
+
+def retrain(daily, output_dir, params=None, source=None):
+    """Run ``train_model`` in a separate process, keeping the calling process responsive."""
+    # Spawned, not forked: this runs on a worker thread of a multithreaded Qt process
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        return executor.submit(train_model, daily, output_dir, params, source).result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scaler_from_forest(model, columns=FEATURES):
+    """Recover the StandardScaler a forest was trained behind from the forest itself.
+
+    For models whose scaler was not saved, such as the bundled one (see
+    ``write_bundled_scaler``). The calendar features take whole values, so
+    their split thresholds sit on a grid half a day or month apart (between
+    two neighbouring values, or on a value missing from a node): the grid
+    step gives the scale. The training rows are assumed to include each
+    feature's smallest value (a Monday, a January day), so the lowest
+    threshold is half a unit above it, which gives the mean. The lags are
+    the target shifted by whole days, so their mean and spread are estimated
+    from the target's, which every tree's root node records.
+
+    Raises ValueError if the recovered calendar thresholds fall outside
+    ``CALENDAR_RANGES`` or off the half-unit grid.
+    """
+    from sklearn.preprocessing import StandardScaler
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    weights = np.array([tree.weighted_n_node_samples[0] for tree in trees])
+    target_mean = np.average([tree.value[0, 0, 0] for tree in trees], weights=weights)
+    target_scale = np.sqrt(np.average([tree.impurity[0] for tree in trees], weights=weights))
+
+    mean, scale = [], []
+    for index, column in enumerate(columns):
+        if column in CALENDAR_RANGES:
+            low, high = CALENDAR_RANGES[column]
+            thresholds = np.unique(np.concatenate([tree.threshold[tree.feature == index] for tree in trees]))
+            steps = np.diff(thresholds)
+            # Thresholds are stored as float32, so neighbours closer than this are the same grid point
+            column_scale = 0.5 / steps[steps > 1e-4].min()
+            column_mean = low + 0.5 - thresholds[0] * column_scale
+            raw = column_mean + thresholds * column_scale
+            off_grid = np.abs(raw * 2 - np.round(raw * 2)).max()
+            if off_grid > CALENDAR_GRID_TOLERANCE or raw[-1] > high - 0.5 + CALENDAR_GRID_TOLERANCE:
+                raise ValueError(f"Recovered {column} splits span {raw[0]:.3g}-{raw[-1]:.3g} "
+                                 f"and are off the half-unit grid by up to {off_grid / 2:.3g}")
+            mean.append(column_mean)
+            scale.append(column_scale)
+        elif column in {f'lag_{lag}' for lag in LAGS}:
+            mean.append(target_mean)
+            scale.append(target_scale)
+        else:
+            raise ValueError(f"Cannot recover the scaling of feature {column!r}")
+
+    scaler = StandardScaler()
+    scaler.mean_ = np.array(mean)
+    scaler.scale_ = np.array(scale)
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(columns)
+    scaler.feature_names_in_ = np.array(columns, dtype=object)
+    scaler.n_samples_seen_ = int(max(weights))
+    return scaler
+
+
+def check_scaler_recovery(trials=3):
+    """Check ``scaler_from_forest`` on forests whose true scaler is known.
+
+    Each trial trains a forest the way the bundled model was trained
+    (prediction_expense_model/expense_prediction.ipynb: one daily total
+    series from January on, lag and calendar features, a StandardScaler
+    fitted on all rows, the first 80% used for training) on synthetic daily
+    totals of about one to two years, then compares the recovered scaler
+    with the fitted one. Raises ValueError
+    beyond ``RECOVERY_RTOL``; returns the largest relative error per feature.
+    """
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    worst = np.zeros(len(FEATURES))
+    for seed in range(trials):
+        rng = np.random.default_rng(seed)
+        days = pd.date_range('2022-01-01', periods=int(rng.integers(300, 800)), freq='D')
+        amounts = pd.Series(rng.gamma(2, 400, len(days)) * np.where(days.dayofweek >= 5, 1.3, 1.0), index=days)
+        X = pd.DataFrame({f'lag_{lag}': amounts.shift(lag) for lag in LAGS})
+        X['day_of_week'] = days.dayofweek
+        X['month'] = days.month
+        X = X[FEATURES].iloc[max(LAGS):]
+        y = amounts.iloc[max(LAGS):].to_numpy()
+
+        scaler = StandardScaler().fit(X)
+        split = int(len(X) * (1 - TEST_FRACTION))
+        model = RandomForestRegressor(**DEFAULT_FOREST_PARAMS, random_state=seed)
+        model.fit(scaler.transform(X)[:split], y[:split])
+
+        recovered = scaler_from_forest(model)
+        error = np.maximum(np.abs(recovered.mean_ / scaler.mean_ - 1), np.abs(recovered.scale_ / scaler.scale_ - 1))
+        worst = np.maximum(worst, error)
+    errors = dict(zip(FEATURES, worst.tolist()))
+    for column, error in errors.items():
+        if error > RECOVERY_RTOL[column]:
+            raise ValueError(f"Recovered scaling of {column} is off by {error:.1%} on known data")
+    return errors
+
+
+def write_bundled_scaler(model_path=DEFAULT_MODEL_PATH):
+    """Rebuild the bundled model's scaler file; returns its path.
+
+    The notebook that trained the bundled model did not save its scaler,
+    and its training data is not part of the repository, so the scaler is
+    recovered from the model with ``scaler_from_forest`` once
+    ``check_scaler_recovery`` has passed.
+    """
+    errors = check_scaler_recovery()
+    print("Scaler recovery on known data, largest relative error: "
+          + ", ".join(f"{column} {error:.2%}" for column, error in errors.items()))
+    scaler = scaler_from_forest(load_model_file(model_path))
+    path = os.path.join(os.path.dirname(model_path), BUNDLED_SCALER)
+    write_scaler(scaler, FEATURES, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m logic.training',
+        description="Maintenance tasks for the expense models.",
+    )
+    parser.add_argument('--bundled-scaler', action='store_true',
+                        help=f"rebuild the bundled model's {BUNDLED_SCALER} from the model")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="bundled model file")
+    args = parser.parse_args(argv)
+    if not args.bundled_scaler:
+        parser.print_help()
+        return 1
+    print(f"Wrote {write_bundled_scaler(args.model)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import os
+from PySide6.QtCore import QObject, Signal
+import pandas as pd
+from logic.dtypes import normalize_frame
+from logic.file_import import concat_frames, expand_paths, import_files, read_transactions
+from logic.tasks import get_task_runner
+from logic.rollup import RollupCube
+
+
+def load_transactions(file_path, progress=None):
+    """Parse a file and build its rollup cube; safe to run on a worker thread."""
+    data = read_transactions(file_path, progress=progress)
+    if progress is not None:
+        progress(100, 100, "Aggregating...")
+    return data, RollupCube.from_frame(data)
+
+
+def load_many_transactions(file_paths, progress=None):
+    """Parse files and folders in parallel, deduplicate and build one rollup cube.
+
+    Returns the data, its cube and the import report of ``import_files``.
+    """
+    file_paths = expand_paths(file_paths)
+    if not file_paths:
+        raise ValueError("No CSV or Excel files were selected.")
+    data, report = import_files(file_paths, progress=progress)
+    if progress is not None:
+        progress(100, 100, "Aggregating...")
+    return data, RollupCube.from_frame(data), report
+
+
+class TransactionStore(QObject):
+    """Owns the single parsed copy of the transaction data shared by every view.
+
+    Views must treat ``data`` as read-only and copy before adding columns.
+    """
+
+    # Emitted whenever the shared DataFrame is replaced
+    data_changed = Signal()
+    # Emitted with the new rows after an incremental append; the rollup is already updated
+    data_appended = Signal(object)
+    # Emitted with an error message when a background load fails
+    load_failed = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._data = pd.DataFrame()
+        # Appended frames not yet concatenated onto _data
+        self._pending = []
+        self._rollup = RollupCube()
+        self.file_path = None
+        # Bumped on every change so consumers can key caches on it
+        self.version = 0
+        self._load_task = None
+
+    @property
+    def data(self):
+        """The current transaction DataFrame (empty until a file is loaded).
+
+        Appended rows are concatenated lazily, the first time the full frame is
+        needed, so a burst of appends costs one concat rather than one each.
+        """
+        if self._pending:
+            # concat_frames keeps Category/Currency categorical across the appended frames;
+            # an empty starting frame would turn every column into object
+            frames = [self._data] if len(self._data) else []
+            self._data = concat_frames(frames + self._pending)
+            self._pending = []
+        return self._data
+
+    @property
+    def rollup(self):
+        """Precomputed time x category aggregates of ``data``."""
+        return self._rollup
+
+    def is_empty(self):
+        return self._data.empty and not self._pending
+
+    def load_file(self, file_path, progress=None):
+        """Parse a file once, on the calling thread, and publish it to every view.
+
+        ``progress`` is forwarded to import_excel for streamed CSV imports.
+        """
+        try:
+            data, rollup = load_transactions(file_path, progress=progress)
+        except Exception as e:
+            print(f"Error loading file: {e}")
+            return False
+        self.set_data(data, file_path, rollup)
+        return True
+
+    def load_file_async(self, file_path, on_progress=None, on_loaded=None, on_error=None):
+        """Parse a file on the worker pool and publish it on the UI thread.
+
+        A load still in flight is cancelled, so only the newest file is published.
+        Returns the Task, whose signals can also be connected to directly.
+        """
+        return self._start_load(load_transactions, file_path, file_path, on_progress, on_loaded, on_error)
+
+    def load_files_async(self, file_paths, on_progress=None, on_loaded=None, on_error=None):
+        """Parse several files and folders in parallel and publish them as one deduplicated dataset.
+
+        ``on_loaded`` receives the import report with per-file rows and timings.
+        """
+        source = os.path.commonpath(file_paths) if file_paths else None
+        return self._start_load(load_many_transactions, file_paths, source, on_progress, on_loaded, on_error)
+
+    def _start_load(self, fn, source, file_path, on_progress, on_loaded, on_error):
+        """Run ``fn(source)``, which returns ``(data, rollup, *extra)``; ``on_loaded`` gets the extras."""
+        if self._load_task is not None:
+            self._load_task.cancel()
+
+        def publish(result):
+            # Ignore results from a load that has since been superseded
+            if task is self._load_task:
+                self._load_task = None
+                data, rollup, *extra = result
+                self.set_data(data, file_path, rollup)
+                if on_loaded is not None:
+                    on_loaded(*extra)
+
+        def fail(message):
+            if task is self._load_task:
+                self._load_task = None
+            self.load_failed.emit(message)
+            if on_error is not None:
+                on_error(message)
+
+        task = get_task_runner().submit(
+            fn, source,
+            on_result=publish, on_error=fail, on_progress=on_progress,
+        )
+        self._load_task = task
+        return task
+
+    def append_file_async(self, file_path, on_progress=None, on_loaded=None, on_error=None):
+        """Parse another file (e.g. next month's export) on the worker pool and append it."""
+        def publish(result):
+            data, rollup = result
+            self.append(data, rollup)
+            if on_loaded is not None:
+                on_loaded()
+
+        def fail(message):
+            self.load_failed.emit(message)
+            if on_error is not None:
+                on_error(message)
+
+        return get_task_runner().submit(
+            load_transactions, file_path,
+            on_result=publish, on_error=fail, on_progress=on_progress,
+        )
+
+    def append(self, rows, rollup=None):
+        """Append transactions and fold them into the rollup in O(len(rows)).
+
+        Subscribers get data_appended rather than data_changed, so they can
+        refresh from the updated rollup without rescanning history.
+        """
+        if rows.empty:
+            return
+        if 'Date' in rows.columns:
+            rows = rows.assign(Date=pd.to_datetime(rows['Date']))
+        self._pending.append(normalize_frame(rows))
+        self._rollup.apply(rows, rollup)
+        self.version += 1
+        self.data_appended.emit(rows)
+
+    def set_data(self, data, file_path=None, rollup=None):
+        """Replace the shared data and notify subscribers (UI thread only).
+
+        Pass a prebuilt ``rollup`` to avoid aggregating on the UI thread.
+        """
+        self._data = data
+        self._pending = []
+        self._rollup = rollup if rollup is not None else RollupCube.from_frame(data)
+        self.file_path = file_path
+        self.version += 1
+        self.data_changed.emit()
+
+
+_store = None
+
+
+def get_store():
+    """Return the application-wide transaction store, creating it on first use."""
+    global _store
+    if _store is None:
+        _store = TransactionStore()
+    return _store